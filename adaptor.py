@@ -1,18 +1,42 @@
 import asyncio
-import json
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from operator import itemgetter
+from typing import IO, AsyncIterator, Dict, Any, Iterable, Optional, Union
+
+from dedup import Deduplicator
+from decoders import JsonDecoder, RawResponse, get_decoder
+from fixtures import load
+from streaming import DEFAULT_CHUNK_SIZE, iter_json_documents
+
+
+_KEEP_LAST_3_BY_PRICE = Deduplicator(key=itemgetter('price'), price=itemgetter('price'))
 
 
 class RideAdapter(ABC):
+    def __init__(self, decoder: Optional[JsonDecoder] = None):
+        self.decoder = decoder or get_decoder()
+
+    async def adapt(self, response_json: RawResponse) -> Dict[str, Any]:
+        return self.normalize(self.decoder.loads(response_json))
+
     @abstractmethod
-    async def adapt(self, response_json: str) -> Dict[str, Any]:
+    def normalize(self, data: Dict[str, Any]) -> Dict[str, Any]:
         pass
 
+    async def adapt_many(self, responses: Iterable[Union[RawResponse, Dict[str, Any]]]) -> AsyncIterator[Dict[str, Any]]:
+        for response in responses:
+            if not isinstance(response, dict):
+                yield await self.adapt(response)
+            else:
+                yield self.normalize(response)
+
+    async def adapt_stream(self, fileobj: IO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[Dict[str, Any]]:
+        for data in iter_json_documents(fileobj, chunk_size):
+            yield self.normalize(data)
+
 
 class TapsiPriceAdapter(RideAdapter):
-    async def adapt(self, response_json: str) -> Dict[str, Any]:
-        data = json.loads(response_json)
+    def normalize(self, data: Dict[str, Any]) -> Dict[str, Any]:
         services_info = []
 
         categories = data.get('data', {}).get('categories', [])
@@ -35,83 +59,11 @@ class TapsiPriceAdapter(RideAdapter):
 
     def _remove_duplicates_keep_last_3(self, services):
         """حذف تکراری‌ها بر اساس قیمت با حفظ ترتیب"""
-        # ایجاد دیکشنری با قیمت به عنوان کلید
-        price_to_service = {}
-        for service in services:
-            price_to_service[service['price']] = service
-
-        # تبدیل به لیست و نگه داشتن ۳ مورد آخر
-        unique_services = list(price_to_service.values())
-        return unique_services[-3:]
-
-
-# داده تست که از خودت گرفتم
-tapsi_raw = '''{
-  "result": "OK",
-  "data": {
-    "categories": [
-      {
-        "key": "SUGGESTION",
-        "title": "پیشنهادی",
-        "items": [
-          {
-            "service": {
-              "key": "STANDARD",
-              "prices": [{"type": "CERTAIN", "passengerShare": 65000}]
-            }
-          },
-          {
-            "service": {
-              "key": "WAIT_AND_SAVE",
-              "prices": [{"type": "CERTAIN", "passengerShare": 60000}]
-            }
-          },
-          {
-            "service": {
-              "key": "PLUS",
-              "prices": [{"type": "CERTAIN", "passengerShare": 85000}]
-            }
-          }
-        ]
-      },
-      {
-        "key": "NORMAL",
-        "title": "دربستی",
-        "items": [
-          {
-            "service": {
-              "key": "STANDARD",
-              "prices": [{"type": "CERTAIN", "passengerShare": 65000}]
-            }
-          },
-          {
-            "service": {
-              "key": "PLUS",
-              "prices": [{"type": "CERTAIN", "passengerShare": 85000}]
-            }
-          }
-        ]
-      },
-      {
-        "key": "ECONOMIC",
-        "title": "اقتصادی",
-        "items": [
-          {
-            "service": {
-              "key": "WAIT_AND_SAVE",
-              "prices": [{"type": "CERTAIN", "passengerShare": 60000}]
-            }
-          }
-        ]
-      }
-    ]
-  }
-}'''
+        return _KEEP_LAST_3_BY_PRICE(services)
 
 
 class SnappAdapter(RideAdapter):
-    async def adapt(self, response_json: str) -> Dict[str, Any]:
-        data = json.loads(response_json)
+    def normalize(self, data: Dict[str, Any]) -> Dict[str, Any]:
         services_info = []
 
         prices = data.get('data', {}).get('prices', [])
@@ -130,266 +82,9 @@ class SnappAdapter(RideAdapter):
         return {'services': services_info}
 
 
-snapp_raw = '''{
-    "status": 200,
-    "data": {
-        "prices": [
-            {
-                "final": 840000,
-                "final_lower": null,
-                "is_hurry_enable": true,
-                "raw_fare": null,
-                "raw_fare_lower": null,
-                "type": "1",
-                "is_free_ride": false,
-                "is_discounted_price": false,
-                "is_surged": false,
-                "is_enabled": true,
-                "is_post_price": false,
-                "tag": "",
-                "texts": {
-                    "free_ride": "",
-                    "free_ride_footer": "",
-                    "discounted_price": "تخفیف برای شما!",
-                    "discounted_price_footer": "تبریک، این سفر ۰٪ تخفیف دارد. از سفرتان لذت ببرید!",
-                    "surge": "",
-                    "surge_footer": "",
-                    "disabled_reason": "",
-                    "surge_link": null,
-                    "promotion_message": "",
-                    "promotion_message_footer": "",
-                    "discount_and_surge_price": "تخفیف برای افزایش قیمت موقت",
-                    "discount_and_surge_price_footer": "به دلیل بالا رفتن تقاضا، هزینه این سفر به طور موقت از سقف شورای شهر برای تاکسی تلفنی بیشتر است. همچنین این سرویس شامل ۰٪ تخفیف شده است.",
-                    "post_price": "",
-                    "post_price_footer": "",
-                    "priority_offer_button": "درخواست پیشتاز"
-                },
-                "distance": 0,
-                "eta": "",
-                "eta_texts": [
-                    "16:09"
-                ],
-                "items": [],
-                "promotion_error": "",
-                "voucher_type": 0,
-                "tcv": "",
-                "pickup_eta": "",
-                "flexi": {
-                    "is_enabled": false,
-                    "config": {
-                        "open_dialogue_button": "",
-                        "title": "",
-                        "description": "",
-                        "confirm_button": "",
-                        "warning_message": ""
-                    },
-                    "prices": null
-                }
-            },
-            {
-                "final": 1000000,
-                "final_lower": null,
-                "is_hurry_enable": true,
-                "raw_fare": 1110000,
-                "raw_fare_lower": null,
-                "type": "2",
-                "is_free_ride": false,
-                "is_discounted_price": true,
-                "is_surged": false,
-                "is_enabled": true,
-                "is_post_price": false,
-                "tag": "",
-                "texts": {
-                    "free_ride": "",
-                    "free_ride_footer": "",
-                    "discounted_price": "تخفیف برای شما!",
-                    "discounted_price_footer": "تبریک، این سفر ۹٪ تخفیف دارد. از سفرتان لذت ببرید!",
-                    "surge": "",
-                    "surge_footer": "",
-                    "disabled_reason": "",
-                    "surge_link": null,
-                    "promotion_message": "",
-                    "promotion_message_footer": "",
-                    "discount_and_surge_price": "تخفیف برای افزایش قیمت موقت",
-                    "discount_and_surge_price_footer": "به دلیل بالا رفتن تقاضا، هزینه این سفر به طور موقت از سقف شورای شهر برای تاکسی تلفنی بیشتر است. همچنین این سرویس شامل ۹٪ تخفیف شده است.",
-                    "post_price": "",
-                    "post_price_footer": "",
-                    "priority_offer_button": "درخواست پیشتاز"
-                },
-                "distance": 0,
-                "eta": "",
-                "eta_texts": [
-                    "16:09"
-                ],
-                "items": [],
-                "promotion_error": "",
-                "voucher_type": 0,
-                "tcv": "",
-                "pickup_eta": "",
-                "flexi": {
-                    "is_enabled": false,
-                    "config": {
-                        "open_dialogue_button": "",
-                        "title": "",
-                        "description": "",
-                        "confirm_button": "",
-                        "warning_message": ""
-                    },
-                    "prices": null
-                }
-            }
-        ],
-        "tag": "0",
-        "confirm_before_ride": false,
-        "confirm_before_ride_message": "",
-        "waiting": [
-            {
-                "key": "0m-5m",
-                "price": 30000,
-                "text": "۰ تا ۵ دقیقه"
-            },
-            {
-                "key": "5m-10m",
-                "price": 60000,
-                "text": "۵ تا ۱۰ دقیقه"
-            },
-            {
-                "key": "10m-15m",
-                "price": 90000,
-                "text": "۱۰ تا ۱۵ دقیقه"
-            },
-            {
-                "key": "15m-20m",
-                "price": 120000,
-                "text": "۱۵ تا ۲۰ دقیقه"
-            },
-            {
-                "key": "20m-25m",
-                "price": 150000,
-                "text": "۲۰ تا ۲۵ دقیقه"
-            },
-            {
-                "key": "25m-30m",
-                "price": 180000,
-                "text": "۲۵ تا ۳۰ دقیقه"
-            },
-            {
-                "key": "30m-45m",
-                "price": 270000,
-                "text": "۳۰ تا ۴۵ دقیقه"
-            },
-            {
-                "key": "45m-1h",
-                "price": 360000,
-                "text": "۴۵ دقیقه تا ۱ ساعت"
-            },
-            {
-                "key": "1h-1h30m",
-                "price": 540000,
-                "text": "۱ تا ۱.۵ ساعت"
-            },
-            {
-                "key": "1h30m-2h",
-                "price": 720000,
-                "text": "۱.۵ تا ۲ ساعت"
-            },
-            {
-                "key": "2h-2h30m",
-                "price": 900000,
-                "text": "۲ تا ۲.۵ ساعت"
-            },
-            {
-                "key": "2h30m-3h",
-                "price": 1080000,
-                "text": "۲.۵ تا ۳ ساعت"
-            },
-            {
-                "key": "3h-3h30m",
-                "price": 1260000,
-                "text": "۳ تا ۳.۵ ساعت"
-            },
-            {
-                "key": "3h30m-4h",
-                "price": 1440000,
-                "text": "۳.۵ تا ۴ ساعت"
-            },
-            {
-                "key": "0m-5m",
-                "price": 30000,
-                "text": "۰ تا ۵ دقیقه"
-            },
-            {
-                "key": "5m-10m",
-                "price": 60000,
-                "text": "۵ تا ۱۰ دقیقه"
-            },
-            {
-                "key": "10m-15m",
-                "price": 90000,
-                "text": "۱۰ تا ۱۵ دقیقه"
-            },
-            {
-                "key": "15m-20m",
-                "price": 120000,
-                "text": "۱۵ تا ۲۰ دقیقه"
-            },
-            {
-                "key": "20m-25m",
-                "price": 150000,
-                "text": "۲۰ تا ۲۵ دقیقه"
-            },
-            {
-                "key": "25m-30m",
-                "price": 180000,
-                "text": "۲۵ تا ۳۰ دقیقه"
-            },
-            {
-                "key": "30m-45m",
-                "price": 270000,
-                "text": "۳۰ تا ۴۵ دقیقه"
-            },
-            {
-                "key": "45m-1h",
-                "price": 360000,
-                "text": "۴۵ دقیقه تا ۱ ساعت"
-            },
-            {
-                "key": "1h-1h30m",
-                "price": 540000,
-                "text": "۱ تا ۱.۵ ساعت"
-            },
-            {
-                "key": "1h30m-2h",
-                "price": 720000,
-                "text": "۱.۵ تا ۲ ساعت"
-            },
-            {
-                "key": "2h-2h30m",
-                "price": 900000,
-                "text": "۲ تا ۲.۵ ساعت"
-            },
-            {
-                "key": "2h30m-3h",
-                "price": 1080000,
-                "text": "۲.۵ تا ۳ ساعت"
-            },
-            {
-                "key": "3h-3h30m",
-                "price": 1260000,
-                "text": "۳ تا ۳.۵ ساعت"
-            },
-            {
-                "key": "3h30m-4h",
-                "price": 1440000,
-                "text": "۳.۵ تا ۴ ساعت"
-            }
-        ],
-        "details": null
-    }
-}'''
-
-
 async def main():
+    tapsi_raw = load("tapsi_small.json")
+    snapp_raw = load("snapp.json")
     tapsi_adapter = TapsiPriceAdapter()
     snapp_adapter = SnappAdapter()
 
@@ -408,4 +103,5 @@ async def main():
         discount_status = "✅ دارد" if service['is_discounted'] else "❌ ندارد"
         print(f"  نوع {service['type']}: {service['final_price']:,} تومان - تخفیف: {discount_status}")
 
-asyncio.run(main())
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(main())
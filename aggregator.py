@@ -0,0 +1,60 @@
+import asyncio
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config import RideAdapter
+from decoders import RawResponse
+
+if TYPE_CHECKING:
+    from models import BaseServiceModel
+
+Fetch = Callable[..., Awaitable[RawResponse]]
+
+
+class QuoteAggregator:
+    """گرفتن و تبدیل قیمت همه‌ی سرویس‌دهنده‌ها به صورت هم‌زمان
+
+    هر سرویس‌دهنده مهلت خودش را دارد؛ اگر دیر کند یا خطا بدهد نتیجه‌ی بقیه
+    برگردانده می‌شود، پس تأخیر کل برابر کندترین سرویس‌دهنده‌ی در مهلت است نه مجموع.
+    """
+
+    def __init__(self, default_timeout: float = 2.0):
+        self.default_timeout = default_timeout
+        self._providers: Dict[str, Tuple[RideAdapter, Fetch, float]] = {}
+
+    def register(self, name: str, adapter: RideAdapter, fetch: Fetch,
+                 timeout: Optional[float] = None) -> None:
+        self._providers[name] = (adapter, fetch, self.default_timeout if timeout is None else timeout)
+
+    def unregister(self, name: str) -> None:
+        self._providers.pop(name, None)
+
+    @property
+    def providers(self) -> List[str]:
+        return list(self._providers)
+
+    async def _quote_one(self, name: str, *args: Any, **kwargs: Any) -> List["BaseServiceModel"]:
+        adapter, fetch, timeout = self._providers[name]
+        async with asyncio.timeout(timeout):
+            raw = await fetch(*args, **kwargs)
+            return await adapter.adapt(raw)
+
+    async def quote_all(self, *args: Any, **kwargs: Any
+                        ) -> Tuple[List["BaseServiceModel"], Dict[str, BaseException]]:
+        """نتیجه‌ی یکپارچه به همراه خطای سرویس‌دهنده‌هایی که جواب ندادند"""
+        names = list(self._providers)
+        results = await asyncio.gather(
+            *(self._quote_one(name, *args, **kwargs) for name in names),
+            return_exceptions=True,
+        )
+        unified: List["BaseServiceModel"] = []
+        errors: Dict[str, BaseException] = {}
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                errors[name] = result
+            else:
+                unified.extend(result)
+        return unified, errors
+
+    async def quote(self, *args: Any, **kwargs: Any) -> List["BaseServiceModel"]:
+        unified, _ = await self.quote_all(*args, **kwargs)
+        return unified
@@ -0,0 +1,126 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+import registry
+from streaming import iter_json_documents
+
+DEFAULT_SHARD_SIZE = 64 << 20
+
+
+class Shard(NamedTuple):
+    index: int
+    path: str
+    start: int
+    end: int
+    is_array: bool
+
+
+def _is_json_array(path: str) -> bool:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(4096)
+            if not chunk:
+                return False
+            stripped = chunk.lstrip()
+            if stripped:
+                return stripped[:1] == b"["
+
+
+def plan_shards(paths: List[str], shard_size: int = DEFAULT_SHARD_SIZE) -> List[Shard]:
+    """فایل‌های JSONL به بازه‌های بایتی تقسیم می‌شوند؛ آرایه‌ی JSON کامل به یک worker می‌رسد
+
+    آرایه تقسیم نمی‌شود، پس برای موازی‌سازی یک آرایه‌ی بزرگ اول آن را به JSONL تبدیل کنید.
+    """
+    shards: List[Shard] = []
+    for path in paths:
+        size = os.path.getsize(path)
+        if _is_json_array(path):
+            shards.append(Shard(len(shards), path, 0, size, True))
+            continue
+        for start in range(0, max(size, 1), shard_size):
+            shards.append(Shard(len(shards), path, start, min(start + shard_size, size), False))
+    return shards
+
+
+def _iter_jsonl_range(path: str, start: int, end: int) -> Iterator[Tuple[int, bytes]]:
+    # هر خط متعلق به shardی است که اولین بایتش در بازه‌ی آن باشد؛ همراه با offset بایتی خط
+    with open(path, "rb") as f:
+        if start:
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                yield offset, line
+
+
+def run_shard(shard: Shard, provider: str, out_dir: str, projected: bool = False) -> Tuple[int, int, int]:
+    adapter = registry.create_adapter(provider, projected=projected)
+    out_path = os.path.join(out_dir, f"part-{shard.index:05d}.jsonl")
+    responses = services = 0
+    # هر سطر خروجی به سند ورودی‌اش برمی‌گردد: source و index (خانه‌ی آرایه) یا offset (بایت شروع خط JSONL)
+    if shard.is_array:
+        f = open(shard.path, "rb")
+        locator = "index"
+        documents = ((i, adapter.normalize_records(d)) for i, d in enumerate(iter_json_documents(f)))
+    else:
+        f = None
+        locator = "offset"
+        documents = ((offset, adapter.adapt_records_sync(line))
+                     for offset, line in _iter_jsonl_range(shard.path, shard.start, shard.end))
+    try:
+        with open(out_path, "w", encoding="utf-8") as out:
+            for position, records in documents:
+                for r in records:
+                    row = r._asdict()
+                    row["source"] = shard.path
+                    row[locator] = position
+                    out.write(json.dumps(row, ensure_ascii=False))
+                    out.write("\n")
+                responses += 1
+                services += len(records)
+    finally:
+        if f is not None:
+            f.close()
+    return shard.index, responses, services
+
+
+def run(paths: List[str], provider: str, out_dir: str, workers: Optional[int] = None,
+        shard_size: int = DEFAULT_SHARD_SIZE, projected: bool = False) -> Tuple[int, int]:
+    os.makedirs(out_dir, exist_ok=True)
+    shards = plan_shards(paths, shard_size)
+    total_responses = total_services = 0
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(run_shard, s, provider, out_dir, projected) for s in shards]
+        for future in as_completed(futures):
+            _, responses, services = future.result()
+            total_responses += responses
+            total_services += services
+    return total_responses, total_services
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="نرمال‌سازی موازی پاسخ‌های ضبط‌شده")
+    parser.add_argument("inputs", nargs="+",
+                        help="JSONL files (split into --shard-size byte ranges) or JSON array files "
+                             "(each array file is processed whole by a single worker)")
+    parser.add_argument("--provider", choices=registry.names(), required=True)
+    parser.add_argument("--out", required=True, help="output directory for part-*.jsonl")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="bytes per JSONL shard")
+    parser.add_argument("--projected", action="store_true")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    responses, services = run(args.inputs, args.provider, args.out, args.workers,
+                              args.shard_size, args.projected)
+    elapsed = time.perf_counter() - started
+    print(f"{responses:,} responses -> {services:,} services in {elapsed:.2f}s "
+          f"({responses / elapsed:,.0f} resp/s)")
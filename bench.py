@@ -0,0 +1,409 @@
+import argparse
+import asyncio
+import itertools
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import adaptor
+import main as samples
+from config import RideAdapter, SnappAdapter, TapsiPriceAdapter
+from decoders import get_decoder
+
+
+def load_snapp_payloads(path: str = "generated_data_list.json") -> List[bytes]:
+    with open(path, "rb") as f:
+        return [json.dumps(r, ensure_ascii=False).encode() for r in json.load(f)]
+
+
+def _timeit(fn: Callable[[bytes], object], payloads: List[bytes], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for p in payloads:
+            fn(p)
+    return time.perf_counter() - start
+
+
+def _alloc_per_response(fn: Callable[[bytes], object], payloads: List[bytes]) -> float:
+    # حجم اشیای زنده‌ی نگه‌داشته‌شده برای هر پاسخ پارس‌شده
+    tracemalloc.start()
+    kept = [fn(p) for p in payloads]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size / len(payloads)
+
+
+def bench_projection(adapter_cls: type, payloads: List[bytes], repeat: int = 20) -> Dict[str, Dict[str, float]]:
+    """مقایسه‌ی پارس کامل json.loads با پارس projection یک آداپتور"""
+    full: RideAdapter = adapter_cls(decoder=get_decoder("json"))
+    fast: RideAdapter = adapter_cls()
+    projected: RideAdapter = adapter_cls(projected=True)
+    modes = {
+        "json.loads": full.parse,
+        f"{fast.decoder.name} (full)": fast.parse,
+        "projected": projected.parse,
+    }
+    results = {}
+    for name, fn in modes.items():
+        elapsed = _timeit(fn, payloads, repeat)
+        results[name] = {
+            "responses_per_sec": len(payloads) * repeat / elapsed,
+            "bytes_per_response": _alloc_per_response(fn, payloads),
+        }
+    return results
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+async def _loop_lag_during(work, interval: float = 0.001) -> List[float]:
+    # یک تیکر هر interval ثانیه بیدار می‌شود؛ دیرکرد بیدار شدن یعنی loop بلاک شده
+    loop = asyncio.get_running_loop()
+    lags: List[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = loop.time()
+            await asyncio.sleep(interval)
+            lags.append(loop.time() - start - interval)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    await work
+    done.set()
+    await task
+    return lags
+
+
+def bench_event_loop(adapter_cls: type, payloads: List[bytes],
+                     workers: int = 4) -> Dict[str, Dict[str, float]]:
+    """تأخیر event loop هنگام تبدیل پاسخ‌ها: درجا، thread pool و process pool"""
+    executors: Dict[str, Callable[[], Optional[Executor]]] = {
+        "inline": lambda: None,
+        "threads": lambda: ThreadPoolExecutor(workers),
+        "processes": lambda: ProcessPoolExecutor(workers),
+    }
+    results = {}
+    for name, make in executors.items():
+        executor = make()
+        adapter: RideAdapter = adapter_cls(executor=executor)
+
+        async def run():
+            # گرم کردن بدون زمان‌گیری: import تنبل pydantic و بالا آمدن workerها جزو اندازه‌گیری نیست
+            await asyncio.gather(*(adapter.adapt(payloads[0]) for _ in range(workers if executor else 1)))
+            start = time.perf_counter()
+            lags = await _loop_lag_during(adapter.adapt_batch(payloads))
+            return lags, time.perf_counter() - start
+
+        lags, elapsed = asyncio.run(run())
+        if executor is not None:
+            executor.shutdown()
+        results[name] = {
+            "responses_per_sec": len(payloads) / elapsed,
+            "lag_p50_ms": percentile(lags, 50) * 1000,
+            "lag_p99_ms": percentile(lags, 99) * 1000,
+            "lag_max_ms": max(lags, default=0.0) * 1000,
+        }
+    return results
+
+
+def adapter_cases() -> Dict[str, Callable[[bytes], Any]]:
+    """آداپتورهای adaptor.py (خروجی dict) و config.py (خروجی pydantic) به شکل تابع همگام"""
+    cases: Dict[str, Callable[[bytes], Any]] = {}
+    for provider, dict_cls, model_cls in (
+        ("tapsi", adaptor.TapsiPriceAdapter, TapsiPriceAdapter),
+        ("snapp", adaptor.SnappAdapter, SnappAdapter),
+    ):
+        dict_adapter = dict_cls()
+        cases[f"{provider}/dict"] = lambda p, a=dict_adapter: a.normalize(a.decoder.loads(p))
+        cases[f"{provider}/records"] = model_cls().adapt_records_sync
+        cases[f"{provider}/model"] = model_cls().adapt_sync
+        cases[f"{provider}/model+construct"] = model_cls(validate=False).adapt_sync
+    return cases
+
+
+def bench_adapter(fn: Callable[[bytes], Any], payloads: List[bytes], n: int,
+                  memory_sample: int = 10_000) -> Dict[str, float]:
+    # یک اجرای بدون زمان‌گیری: import تنبل pydantic نباید به حساب اولین مورد model نوشته شود
+    fn(payloads[0])
+    latencies = []
+    quotes = 0
+    clock = time.perf_counter_ns
+    start = clock()
+    for p in itertools.islice(itertools.cycle(payloads), n):
+        t = clock()
+        out = fn(p)
+        latencies.append(clock() - t)
+        quotes += len(out["services"]) if isinstance(out, dict) else len(out)
+    elapsed = (clock() - start) / 1e9
+
+    # حافظه در اجرای جدا اندازه‌گیری می‌شود چون tracemalloc زمان‌ها را خراب می‌کند
+    tracemalloc.start()
+    kept = [fn(p) for p in itertools.islice(itertools.cycle(payloads), min(n, memory_sample))]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+
+    per_quote = max(quotes, 1) / n
+    return {
+        "responses_per_sec": n / elapsed,
+        "quotes_per_sec": quotes / elapsed,
+        "p50_us": percentile(latencies, 50) / 1000 / per_quote,
+        "p99_us": percentile(latencies, 99) / 1000 / per_quote,
+        "p999_us": percentile(latencies, 99.9) / 1000 / per_quote,
+        "peak_mb": peak / (1 << 20),
+    }
+
+
+def bench_adapters(sizes: List[int]) -> Dict[str, Dict[str, float]]:
+    snapp = load_snapp_payloads()
+    payloads = {"tapsi": [samples.tapsi_raw.encode()], "snapp": snapp + [samples.snapp_raw.encode()]}
+    results = {}
+    for name, fn in adapter_cases().items():
+        for n in sizes:
+            results[f"{name}@{n}"] = bench_adapter(fn, payloads[name.split("/")[0]], n)
+    return results
+
+
+def check_regressions(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                      max_regression: float) -> List[str]:
+    """مواردی که توان عملیاتی‌شان بیش از max_regression نسبت به baseline افت کرده"""
+    failures = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        drop = 1 - r["responses_per_sec"] / base["responses_per_sec"]
+        if drop > max_regression:
+            failures.append(f"{name}: {drop:.1%} slower than baseline")
+    return failures
+
+
+async def _bench_cached_client(server: Any, pool: Any, concurrency: int, requests: int) -> Dict[str, float]:
+    """ProviderClient.fetch_trip ثبت‌شده در QuoteCache؛ ۱۰ سفر تکراری پس بیشتر درخواست‌ها hit هستند"""
+    from clients import ProviderClient
+    from quote_cache import QuoteCache
+
+    client = ProviderClient(TapsiPriceAdapter(), pool, server.url + "/tapsi")
+    cache = QuoteCache(client.adapter, client.fetch_trip)
+    trips = [((35.7 + i * 0.01, 51.4), [(35.75, 51.45)]) for i in range(10)]
+    remaining = iter(range(requests))
+    before = server.requests
+
+    async def worker():
+        for i in remaining:
+            origin, destinations = trips[i % len(trips)]
+            assert await cache.get(origin, destinations)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    upstream = server.requests - before
+    assert upstream == cache.misses == len(trips), (upstream, cache.misses)
+    return {"responses_per_sec": requests / elapsed, "upstream": upstream, "hits": cache.hits}
+
+
+def bench_http(concurrency: int = 16, requests: int = 5000) -> Dict[str, Dict[str, float]]:
+    """توان عملیاتی fetch+adapt از طریق HttpPool روی StubServer محلی"""
+    from clients import HttpPool, ProviderClient
+    from stub_server import StubServer
+
+    async def run():
+        results = {}
+        async with StubServer() as server, HttpPool(max_connections_per_host=concurrency) as pool:
+            results["tapsi/cached"] = await _bench_cached_client(server, pool, concurrency, requests)
+            for name, path, adapter in (("tapsi", "/tapsi", TapsiPriceAdapter()),
+                                        ("snapp", "/snapp/replay", SnappAdapter(projected=True))):
+                client = ProviderClient(adapter, pool, server.url + path, method="GET")
+                # گرم کردن: اتصال‌های keep-alive پیش از اندازه‌گیری باز شوند
+                await asyncio.gather(*(client.fetch() for _ in range(concurrency)))
+                remaining = iter(range(requests))
+                latencies: List[float] = []
+
+                async def worker():
+                    for _ in remaining:
+                        t = time.perf_counter()
+                        await client.quote()
+                        latencies.append(time.perf_counter() - t)
+
+                start = time.perf_counter()
+                await asyncio.gather(*(worker() for _ in range(concurrency)))
+                elapsed = time.perf_counter() - start
+                results[name] = {
+                    "responses_per_sec": requests / elapsed,
+                    "p50_ms": percentile(latencies, 50) * 1000,
+                    "p99_ms": percentile(latencies, 99) * 1000,
+                }
+        return results
+
+    return asyncio.run(run())
+
+
+def scaled_tapsi(scale: int) -> Dict[str, Any]:
+    """tapsi_raw با scale برابر دسته؛ قیمت هر نسخه کمی جابه‌جا می‌شود تا dedup کار واقعی داشته باشد"""
+    data = json.loads(samples.tapsi_raw)
+    categories = data["data"]["categories"]
+    scaled = []
+    for i in range(scale):
+        for cat in json.loads(json.dumps(categories)):
+            for item in cat.get("items", []):
+                for p in item["service"].get("prices", []):
+                    p["passengerShare"] += (i % 7) * 1000
+            scaled.append(cat)
+    data["data"]["categories"] = scaled
+    return data
+
+
+def bench_tapsi_walk(scales: Sequence[int] = (1, 10, 100), repeat: int = 2000) -> Dict[str, Dict[str, float]]:
+    """نرمال‌سازی تپسی روی دیکشنری پارس‌شده: مسیر عمومی + Deduplicator در برابر مسیر ادغام‌شده"""
+    from dedup import Deduplicator
+
+    generic = TapsiPriceAdapter(dedup=Deduplicator())
+    fused = TapsiPriceAdapter()
+    results = {}
+    for scale in scales:
+        data = scaled_tapsi(scale)
+        assert generic.normalize_records(data) == fused.normalize_records(data)
+        n = max(1, repeat // scale)
+        for name, adapter in (("generic", generic), ("fused", fused)):
+            start = time.perf_counter()
+            for _ in range(n):
+                adapter.normalize_records(data)
+            elapsed = time.perf_counter() - start
+            tracemalloc.start()
+            adapter.normalize_records(data)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[f"{name}@x{scale}"] = {"us_per_response": elapsed / n * 1e6, "peak_kb": peak / 1024}
+    return results
+
+
+def bench_surge(n: int = 200_000, window: int = 64) -> Dict[str, float]:
+    """توان عملیاتی SurgeDetector روی رکوردهای واقعی اسنپ (تکرار تا n قیمت)"""
+    from surge import SurgeDetector
+
+    adapter = SnappAdapter()
+    records = [r for p in load_snapp_payloads() for r in adapter.adapt_records_sync(p)]
+    batches = [records[i:i + 32] for i in range(0, len(records), 32)]
+    detector = SurgeDetector(window=window)
+    start = time.perf_counter()
+    while detector.quotes < n:
+        for batch in batches:
+            detector.feed(batch)
+    elapsed = time.perf_counter() - start
+    return {"quotes_per_sec": detector.quotes / elapsed, "us_per_quote": elapsed / detector.quotes * 1e6,
+            "events": detector.events, "services": len(detector)}
+
+
+# ماژول‌هایی که worker های کوتاه‌عمر CLI با آن‌ها شروع می‌شوند و نباید وابستگی سنگین بیاورند
+STARTUP_MODULES = ("config", "registry", "batch_runner", "replay")
+HEAVY_MODULES = ("pydantic", "numpy")
+
+
+def _import_once(module: str) -> Dict[str, Any]:
+    code = (f"import sys, {module}; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, check=True)
+    # خط آخر importtime برای خود ماژول است: "import time: self | cumulative | name"
+    cumulative = next(int(line.split("|")[1]) for line in reversed(proc.stderr.splitlines())
+                      if line.split("|")[-1].strip() == module)
+    return {"import_ms": cumulative / 1000, "heavy": [m for m in proc.stdout.strip().split(",") if m]}
+
+
+def bench_import(modules: Sequence[str] = STARTUP_MODULES, runs: int = 5) -> Dict[str, Dict[str, Any]]:
+    """زمان import هر ماژول در پروسه‌ی تازه با python -X importtime (میانه‌ی چند اجرا)"""
+    results = {}
+    for module in modules:
+        measured = [_import_once(module) for _ in range(runs)]
+        results[module] = {
+            "import_ms": percentile([r["import_ms"] for r in measured], 50),
+            "heavy": measured[-1]["heavy"],
+        }
+    return results
+
+
+def check_import_budget(results: Dict[str, Dict[str, Any]], max_ms: float) -> List[str]:
+    failures = []
+    for module, r in results.items():
+        if r["import_ms"] > max_ms:
+            failures.append(f"{module}: import took {r['import_ms']:.1f}ms (budget {max_ms:.0f}ms)")
+        if r["heavy"]:
+            failures.append(f"{module}: imports {', '.join(r['heavy'])} at startup")
+    return failures
+
+
+def _print(title: str, results: Dict[str, Dict[str, float]]) -> None:
+    print(title)
+    for name, r in results.items():
+        print(f"  {name:<20} {r['responses_per_sec']:>12,.0f} resp/s  {r['bytes_per_response']:>10,.0f} B/resp")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("suite", nargs="?", choices=["adapters", "projection", "loop", "http", "importtime", "surge", "tapsi"], default="adapters")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--save", help="write adapters results as JSON (baseline)")
+    parser.add_argument("--baseline", help="compare adapters results with a saved baseline")
+    parser.add_argument("--max-regression", type=float, default=0.15)
+    parser.add_argument("--max-import-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    if args.suite == "importtime":
+        results = bench_import()
+        for name, r in results.items():
+            print(f"  {name:<14} {r['import_ms']:>8.1f}ms" + (f"  heavy: {', '.join(r['heavy'])}" if r["heavy"] else ""))
+        failures = check_import_budget(results, args.max_import_ms)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        sys.exit(1 if failures else 0)
+
+    snapp = load_snapp_payloads()
+    tapsi = [samples.tapsi_raw.encode()] * len(snapp)
+    if args.suite == "adapters":
+        results = bench_adapters(args.sizes)
+        for name, r in results.items():
+            print(f"  {name:<30} {r['responses_per_sec']:>10,.0f} resp/s {r['quotes_per_sec']:>11,.0f} quotes/s"
+                  f"  per-quote p50 {r['p50_us']:.1f}us p99 {r['p99_us']:.1f}us p99.9 {r['p999_us']:.1f}us"
+                  f"  peak {r['peak_mb']:.1f}MB")
+        if args.save:
+            with open(args.save, "w") as f:
+                json.dump(results, f, indent=2)
+        if args.baseline:
+            with open(args.baseline) as f:
+                failures = check_regressions(results, json.load(f), args.max_regression)
+            for failure in failures:
+                print(f"REGRESSION {failure}")
+            sys.exit(1 if failures else 0)
+    elif args.suite == "http":
+        for name, r in bench_http(requests=args.repeat * 250).items():
+            if "upstream" in r:
+                print(f"  {name:<12} {r['responses_per_sec']:>10,.0f} resp/s  upstream {r['upstream']}  hits {r['hits']:,}")
+            else:
+                print(f"  {name:<12} {r['responses_per_sec']:>10,.0f} resp/s  p50 {r['p50_ms']:.2f}ms  p99 {r['p99_ms']:.2f}ms")
+    elif args.suite == "tapsi":
+        for name, r in bench_tapsi_walk(repeat=args.repeat * 100).items():
+            print(f"  {name:<14} {r['us_per_response']:>10.2f}us/resp  peak {r['peak_kb']:>8.1f}KB")
+    elif args.suite == "surge":
+        r = bench_surge()
+        print(f"  {r['quotes_per_sec']:>10,.0f} quotes/s  {r['us_per_quote']:.2f}us/quote"
+              f"  {r['events']:,} events over {r['services']} services")
+    elif args.suite == "projection":
+        _print("SnappAdapter", bench_projection(SnappAdapter, snapp, args.repeat))
+        _print("TapsiPriceAdapter", bench_projection(TapsiPriceAdapter, tapsi, args.repeat))
+    else:
+        for name, r in bench_event_loop(SnappAdapter, snapp * args.repeat, args.workers).items():
+            print(f"  {name:<10} {r['responses_per_sec']:>10,.0f} resp/s  loop lag p50 {r['lag_p50_ms']:.2f}ms"
+                  f"  p99 {r['lag_p99_ms']:.2f}ms  max {r['lag_max_ms']:.2f}ms")
@@ -0,0 +1,104 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence
+from urllib.parse import urlsplit
+
+from config import RideAdapter, ServiceRecord
+from trips import Location
+
+if TYPE_CHECKING:
+    from models import BaseServiceModel
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (فقط برای فعال کردن HTTP/2 در httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def _location(location: Location) -> Dict[str, float]:
+    if isinstance(location, Mapping):
+        location = location.get("location", location)
+        return {"latitude": location["latitude"], "longitude": location["longitude"]}
+    lat, lng = location
+    return {"latitude": lat, "longitude": lng}
+
+
+class HttpPool:
+    """یک AsyncClient مشترک به ازای هر host با keep-alive و سقف اتصال جدا برای هر host"""
+
+    def __init__(self, max_connections_per_host: int = 32, max_keepalive_per_host: int = 16,
+                 keepalive_expiry: float = 30.0, timeout: float = 5.0, http2: Optional[bool] = None):
+        if httpx is None:
+            raise ImportError("httpx is required for HttpPool")
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_per_host,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self._clients: Dict[str, "httpx.AsyncClient"] = {}
+
+    def client_for(self, url: str) -> "httpx.AsyncClient":
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        client = self._clients.get(origin)
+        if client is None:
+            client = self._clients[origin] = httpx.AsyncClient(
+                base_url=origin, limits=self.limits, timeout=self.timeout, http2=self.http2)
+        return client
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    async def __aenter__(self) -> "HttpPool":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+
+class ProviderClient:
+    """fetch یک سرویس‌دهنده همراه با آداپتور آن
+
+    بدنه‌ی پاسخ به صورت bytes مستقیم به آداپتور می‌رسد و به str تبدیل نمی‌شود.
+    fetch را می‌توان مستقیم در QuoteAggregator ثبت کرد؛ QuoteCache و CoalescingQuoter
+    امضای سفر (origin, destinations, has_return, waiting_time) می‌خواهند که fetch_trip است.
+    """
+
+    def __init__(self, adapter: RideAdapter, pool: HttpPool, url: str, method: str = "POST",
+                 headers: Optional[Mapping[str, str]] = None):
+        self.adapter = adapter
+        self.pool = pool
+        self.url = url
+        self.method = method
+        self.headers = dict(headers or {})
+
+    async def fetch(self, payload: Any = None, **params: Any) -> bytes:
+        client = self.pool.client_for(self.url)
+        response = await client.request(
+            self.method, self.url, json=payload, params=params or None, headers=self.headers)
+        response.raise_for_status()
+        return response.content
+
+    async def fetch_trip(self, origin: Location, destinations: Sequence[Location],
+                         has_return: bool = False, waiting_time: int = 0) -> bytes:
+        """fetch با بدنه‌ی درخواست قیمت سفر (شکل درخواست تپسی)"""
+        return await self.fetch({
+            "origin": _location(origin),
+            "destinations": [_location(d) for d in destinations],
+            "hasReturn": bool(has_return),
+            "waitingTime": int(waiting_time or 0),
+        })
+
+    async def quote(self, payload: Any = None, **params: Any) -> List["BaseServiceModel"]:
+        return await self.adapter.adapt(await self.fetch(payload, **params))
+
+    async def quote_records(self, payload: Any = None, **params: Any) -> List[ServiceRecord]:
+        return await self.adapter.adapt_records(await self.fetch(payload, **params))
@@ -0,0 +1,96 @@
+import asyncio
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Hashable, List, Sequence, TypeVar
+
+from config import RideAdapter, ServiceRecord, to_models
+from trips import Fetch, Location, trip_key
+
+if TYPE_CHECKING:
+    from models import BaseServiceModel
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """درخواست‌های هم‌زمان با یک کلید فقط یک بار اجرا می‌شوند و همه نتیجه‌ی همان را می‌گیرند
+
+    با linger > 0 نتیجه تا چند ثانیه بعد از پایان هم به درخواست‌های تازه داده می‌شود.
+    """
+
+    def __init__(self, linger: float = 0.0):
+        self.linger = linger
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.leaders = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        task = self._calls.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._finished(key, t))
+        # shield: لغو شدن یک منتظر، کار مشترک بقیه را لغو نمی‌کند
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Future) -> None:
+        if self.linger > 0 and not task.cancelled() and task.exception() is None:
+            asyncio.get_running_loop().call_later(self.linger, self._forget, key, task)
+        else:
+            self._forget(key, task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    @property
+    def coalesced(self) -> int:
+        return self.calls - self.leaders
+
+    @property
+    def coalescing_ratio(self) -> float:
+        """تعداد درخواست به ازای هر فراخوانی واقعی upstream"""
+        return self.calls / self.leaders if self.leaders else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "upstream": self.leaders,
+            "coalesced": self.coalesced,
+            "coalescing_ratio": self.coalescing_ratio,
+            "in_flight": len(self._calls),
+        }
+
+
+class CoalescingQuoter:
+    """ادغام درخواست‌های قیمت یکسان (یا با مختصات خیلی نزدیک) جلوی fetch و adapt
+
+    رکوردهای تغییرناپذیر یک بار ساخته می‌شوند و هر منتظر BaseServiceModel خودش را می‌گیرد.
+    """
+
+    def __init__(self, adapter: RideAdapter, fetch: Fetch, precision: int = 4, linger: float = 0.0):
+        self.adapter = adapter
+        self.fetch = fetch
+        self.precision = precision
+        self.flight = SingleFlight(linger)
+
+    async def quote_records(self, origin: Location, destinations: Sequence[Location],
+                            has_return: bool = False, waiting_time: int = 0) -> List[ServiceRecord]:
+        key = trip_key(origin, destinations, has_return, waiting_time, self.precision)
+
+        async def load() -> List[ServiceRecord]:
+            raw = await self.fetch(origin, destinations, has_return, waiting_time)
+            return await self.adapter.adapt_records(raw)
+
+        return list(await self.flight.do(key, load))
+
+    async def quote(self, origin: Location, destinations: Sequence[Location],
+                    has_return: bool = False, waiting_time: int = 0) -> List["BaseServiceModel"]:
+        records = await self.quote_records(origin, destinations, has_return, waiting_time)
+        return to_models(records, self.adapter.validate)
+
+    def stats(self) -> dict:
+        return self.flight.stats()
@@ -0,0 +1,81 @@
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+from interning import StringTable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class QuoteColumns:
+    """خروجی ستونی (struct-of-arrays) برای حجم زیاد قیمت‌ها
+
+    هر ستون یک array پیوسته است؛ provider و service_key با StringTable به کد عددی
+    تبدیل می‌شوند (کد 0 یعنی None) و جدول رشته‌ها فقط یک بار نگه داشته می‌شود.
+    """
+
+    def __init__(self):
+        self.response_index = array("q")
+        self.provider = array("B")
+        self.service = array("I")
+        self.price = array("d")
+        self.raw_price = array("d")
+        self.is_discounted = array("B")
+        self.provider_table = StringTable()
+        self.service_table = StringTable()
+        self.responses = 0
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    @property
+    def providers(self) -> List[Optional[str]]:
+        return self.provider_table.values
+
+    @property
+    def service_keys(self) -> List[Optional[str]]:
+        return self.service_table.values
+
+    def add_response(self, records: Iterable[Any]) -> None:
+        """افزودن سرویس‌های یک پاسخ؛ هر پاسخ یک response_index جدا می‌گیرد"""
+        idx = self.responses
+        self.responses += 1
+        provider_code = self.provider_table.encode
+        service_code = self.service_table.encode
+        for r in records:
+            self.response_index.append(idx)
+            self.provider.append(provider_code(r.provider))
+            self.service.append(service_code(r.service_key))
+            self.price.append(math.nan if r.price is None else r.price)
+            self.raw_price.append(math.nan if r.raw_price is None else r.raw_price)
+            self.is_discounted.append(1 if r.is_discounted else 0)
+
+    def provider_code(self, provider: Optional[str]) -> Optional[int]:
+        return self.provider_table.code(provider)
+
+    def service_code(self, service_key: Optional[str]) -> Optional[int]:
+        return self.service_table.code(service_key)
+
+    def buffers(self) -> Dict[str, memoryview]:
+        return {
+            "response_index": memoryview(self.response_index),
+            "provider": memoryview(self.provider),
+            "service": memoryview(self.service),
+            "price": memoryview(self.price),
+            "raw_price": memoryview(self.raw_price),
+            "is_discounted": memoryview(self.is_discounted),
+        }
+
+    def to_numpy(self) -> Dict[str, "np.ndarray"]:
+        """آرایه‌های NumPy روی همان بافرها (بدون کپی)
+
+        تا وقتی این آرایه‌ها زنده‌اند افزودن به ستون‌ها BufferError می‌دهد.
+        """
+        if np is None:
+            raise ImportError("numpy is required for QuoteColumns.to_numpy()")
+        out = {name: np.frombuffer(buf, dtype=buf.format) for name, buf in self.buffers().items()}
+        out["is_discounted"] = out["is_discounted"].view(np.bool_)
+        return out
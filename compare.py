@@ -0,0 +1,99 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from columnar import QuoteColumns
+from interning import StringTable
+
+
+class TripComparison:
+    """نتیجه‌ی مقایسه‌ی برداری قیمت‌ها برای هر سفر
+
+    آرایه‌های سطر (rank، discount و ...) هم‌ترتیب با ستون‌های ادغام‌شده‌اند و
+    آرایه‌های سفر (min_price، cheapest و ...) یک مقدار برای هر trip دارند.
+    """
+
+    def __init__(self, providers: List[Optional[str]], service_keys: List[Optional[str]],
+                 columns: Dict[str, np.ndarray]):
+        self.providers = providers
+        self.service_keys = service_keys
+        self.columns = columns
+        self.trips: np.ndarray = np.empty(0, dtype=np.int64)
+        self.min_price: np.ndarray = np.empty(0)
+        self.max_price: np.ndarray = np.empty(0)
+        self.spread: np.ndarray = np.empty(0)
+        self.cheapest: np.ndarray = np.empty(0, dtype=np.int64)
+        self.rank: np.ndarray = np.empty(0, dtype=np.int64)
+        self.rank_undiscounted: np.ndarray = np.empty(0, dtype=np.int64)
+        self.discount: np.ndarray = np.empty(0)
+
+    @property
+    def cheapest_provider(self) -> np.ndarray:
+        return self.columns["provider"][self.cheapest]
+
+    @property
+    def cheapest_service(self) -> np.ndarray:
+        return self.columns["service"][self.cheapest]
+
+    def cheapest_names(self, i: int) -> tuple:
+        row = self.cheapest[i]
+        return (self.providers[self.columns["provider"][row]],
+                self.service_keys[self.columns["service"][row]])
+
+
+def _merge(batches: Sequence[QuoteColumns], trip_ids: Optional[Sequence[np.ndarray]]):
+    tables = {"provider": StringTable(), "service": StringTable()}
+    parts: Dict[str, List[np.ndarray]] = {}
+    for i, batch in enumerate(batches):
+        cols = batch.to_numpy()
+        # کدهای هر batch محلی‌اند؛ به جدول مشترک نگاشت می‌شوند
+        for name, local in (("provider", batch.providers), ("service", batch.service_keys)):
+            mapping = np.array([tables[name].encode(value) for value in local], dtype=np.int64)
+            cols[name] = mapping[cols[name]]
+        cols["trip"] = (np.asarray(trip_ids[i])[cols["response_index"]] if trip_ids is not None
+                        else cols["response_index"])
+        for name, values in cols.items():
+            parts.setdefault(name, []).append(values)
+    merged = {name: np.concatenate(values) for name, values in parts.items()}
+    return tables["provider"].values, tables["service"].values, merged
+
+
+def compare_trips(*batches: QuoteColumns, trip_ids: Optional[Sequence[np.ndarray]] = None) -> TripComparison:
+    """مقایسه‌ی قیمت‌ها بین batchهای سرویس‌دهنده‌های مختلف
+
+    به طور پیش‌فرض پاسخ iام هر batch همان سفر iام است؛ trip_ids برای نگاشت دیگر
+    (یک آرایه به ازای هر batch، با طول تعداد پاسخ‌ها) است.
+    """
+    if not batches:
+        # نتیجه‌ی خالی با همان ستون‌ها و نوع‌ها
+        batches, trip_ids = (QuoteColumns(),), None
+    providers, service_keys, cols = _merge(batches, trip_ids)
+    result = TripComparison(providers, service_keys, cols)
+    n = len(cols["price"])
+    if n == 0:
+        return result
+
+    trip, price, raw = cols["trip"], cols["price"], cols["raw_price"]
+    undiscounted = np.where(np.isnan(raw), price, raw)
+    result.discount = undiscounted - price
+
+    # مرتب‌سازی بر اساس (trip, price)؛ NaN آخر هر گروه می‌افتد
+    order = np.lexsort((price, trip))
+    sorted_trip = trip[order]
+    starts = np.flatnonzero(np.r_[True, sorted_trip[1:] != sorted_trip[:-1]])
+    counts = np.diff(np.r_[starts, n])
+
+    result.trips = sorted_trip[starts]
+    result.cheapest = order[starts]
+    result.min_price = price[result.cheapest]
+    result.max_price = np.fmax.reduceat(price[order], starts)
+    result.spread = result.max_price - result.min_price
+
+    within = np.arange(n) - np.repeat(starts, counts)
+    result.rank = np.empty(n, dtype=np.int64)
+    result.rank[order] = within
+
+    order_raw = np.lexsort((undiscounted, trip))
+    result.rank_undiscounted = np.empty(n, dtype=np.int64)
+    result.rank_undiscounted[order_raw] = within
+    return result
@@ -1,30 +1,282 @@
-import asyncio
+from __future__ import annotations
+
 import json
+import sys
+import time
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from pydantic import BaseModel
+from concurrent.futures import Executor
+from itertools import islice
+from typing import (IO, TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterable, List, NamedTuple,
+                    Optional, Sequence, Tuple, Type, TypeVar, Union)
+
+from dedup import LEGACY_KEEP_LAST_3, Deduplicator
+from decoders import JsonDecoder, Projection, RawResponse, get_decoder
+from instrumentation import AdaptStats, Instrumentation
+from lookups import WaitingTiers, token_prices
+from streaming import DEFAULT_CHUNK_SIZE, iter_json_documents
+
+if TYPE_CHECKING:
+    from columnar import QuoteColumns
+    from models import BaseServiceModel
+
+_model_class: Optional[Type[BaseServiceModel]] = None
+
 
+def _model() -> Type[BaseServiceModel]:
+    # pydantic فقط وقتی وارد می‌شود که واقعاً مدلی ساخته شود؛ مسیر رکوردها به آن نیازی ندارد
+    global _model_class
+    if _model_class is None:
+        from models import BaseServiceModel
+        _model_class = BaseServiceModel
+    return _model_class
 
-class BaseServiceModel(BaseModel):
+
+def __getattr__(name: str) -> Any:
+    # سازگاری با from config import BaseServiceModel
+    if name == "BaseServiceModel":
+        return _model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class ServiceRecord(NamedTuple):
+    """نمایش سبک یک سرویس برای مسیر داغ؛ فقط در مرز API به BaseServiceModel تبدیل می‌شود"""
     provider: str
     service_key: str
-    category: Optional[str] = None
+    category: Optional[str]
     price: float
     is_discounted: bool
     discount_text: Optional[str] = None
+    # قیمت پیش از تخفیف (raw_fare اسنپ)
+    raw_price: Optional[float] = None
+    # افزایش قیمت موقت به خاطر تقاضا (is_surged اسنپ)
+    is_surged: bool = False
+
+    def to_model(self, validate: bool = True) -> BaseServiceModel:
+        cls = _model_class or _model()
+        if validate:
+            return cls(**self._asdict())
+        # بدون اعتبارسنجی فقط برای داده‌ی مطمئن؛ در pydantic 2 سریع‌تر از اعتبارسنجی نیست
+        return cls.model_construct(**self._asdict())
+
+
+def to_models(records: Iterable[ServiceRecord], validate: bool = True) -> List[BaseServiceModel]:
+    return [r.to_model(validate) for r in records]
+
+
+class AdaptResult(NamedTuple):
+    """رکوردها به همراه جدول‌های جست‌وجوی پیش‌محاسبه‌شده از همان یک بار پارس"""
+    records: List[ServiceRecord]
+    # هزینه‌ی انتظار اسنپ بر حسب دقیقه
+    waiting: Optional[WaitingTiers] = None
+    # serviceKey -> قیمت از priceData توکن تپسی
+    token_prices: Optional[Dict[str, float]] = None
+
+
+T = TypeVar("T")
+
+
+def _payload_bytes(response_json: RawResponse) -> int:
+    if isinstance(response_json, str):
+        # متن فارسی چندبایتی است؛ len رشته تعداد کاراکتر است نه بایت
+        return len(response_json) if response_json.isascii() else len(response_json.encode())
+    if isinstance(response_json, memoryview):
+        return response_json.nbytes
+    return len(response_json)
+
+
+def _as_price(value: Any) -> Any:
+    return float(value) if isinstance(value, int) else value
+
+
+# جایگزین‌های بدون تخصیص برای .get(..., {}) / .get(..., []) در مسیر داغ؛ هرگز تغییر داده نمی‌شوند
+_NO_DICT: Dict[str, Any] = {}
+_NO_LIST = ()
 
 
 class RideAdapter(ABC):
-    @abstractmethod
-    async def adapt(self, response_json: str) -> List[BaseServiceModel]:
+    provider: str = ""
+    # مسیرهایی از پاسخ که normalize واقعاً می‌خواند؛ برای projected=True
+    projection_paths: Tuple[str, ...] = ()
+    # مرحله‌ی حذف تکراری/انتخاب K پیش‌فرض هر آداپتور
+    default_dedup: Optional[Deduplicator] = None
+    # مسیرهای اضافه‌ای که normalize_result برای جدول‌های جست‌وجو می‌خواند
+    lookup_paths: Tuple[str, ...] = ()
+
+    def __init__(self, decoder: Optional[JsonDecoder] = None, projected: bool = False,
+                 validate: bool = True, executor: Optional[Executor] = None,
+                 batch_size: int = 32, instrumentation: Optional[Instrumentation] = None,
+                 dedup: Optional[Deduplicator] = None, with_lookups: bool = False):
+        self.decoder = decoder or get_decoder()
+        self.validate = validate
+        self.projection = None
+        if projected and self.projection_paths:
+            paths = self.projection_paths + (self.lookup_paths if with_lookups else ())
+            self.projection = Projection(*paths, fallback=self.decoder)
+        # با executor، پارس و نرمال‌سازی در thread/process pool انجام می‌شود تا event loop بلاک نشود
+        self.executor = executor
+        self.batch_size = batch_size
+        self.instrumentation = instrumentation
+        self.dedup = dedup if dedup is not None else self.default_dedup
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # برای ProcessPoolExecutor خود executor قابل pickle نیست و در worker لازم هم نیست
+        state = self.__dict__.copy()
+        state["executor"] = None
+        state["instrumentation"] = None
+        return state
+
+    def parse(self, response_json: RawResponse) -> Dict[str, Any]:
+        if self.projection is not None:
+            return self.projection.loads(response_json)
+        return self.decoder.loads(response_json)
+
+    def adapt_sync(self, response_json: RawResponse) -> List[BaseServiceModel]:
+        if self.instrumentation is None:
+            return self.normalize(self.parse(response_json))
+        return self._instrumented(self.normalize, response_json)
+
+    def adapt_records_sync(self, response_json: RawResponse) -> List[ServiceRecord]:
+        if self.instrumentation is None:
+            return self.normalize_records(self.parse(response_json))
+        return self._instrumented(self.normalize_records, response_json)
+
+    def adapt_result_sync(self, response_json: RawResponse) -> AdaptResult:
+        return self.normalize_result(self.parse(response_json))
+
+    def _instrumented(self, normalize: Callable[[Dict[str, Any]], List[T]],
+                      response_json: RawResponse) -> List[T]:
+        out, stats = self._measure(normalize, response_json)
+        self.instrumentation.record(stats)
+        return out
+
+    def _measure(self, normalize: Callable[[Dict[str, Any]], List[T]],
+                 response_json: RawResponse) -> Tuple[List[T], AdaptStats]:
+        started = time.perf_counter()
+        data = self.parse(response_json)
+        parsed = time.perf_counter()
+        out = normalize(data)
+        done = time.perf_counter()
+        return out, AdaptStats(self.provider, parsed - started, done - parsed,
+                               _payload_bytes(response_json), len(out))
+
+    def measure_sync(self, normalize: str, response_json: RawResponse) -> Tuple[List[Any], AdaptStats]:
+        """اجرا در worker: خروجی به همراه AdaptStats تا فراخواننده آن را ثبت کند"""
+        return self._measure(getattr(self, normalize), response_json)
+
+    def measure_chunk_sync(self, responses: Sequence[RawResponse]) -> List[Tuple[List[Any], AdaptStats]]:
+        return [self._measure(self.normalize, r) for r in responses]
+
+    def adapt_chunk_sync(self, responses: Sequence[RawResponse]) -> List[List[BaseServiceModel]]:
+        return [self.adapt_sync(r) for r in responses]
+
+    async def _offload(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.executor is None:
+            return fn(*args)
+        # داخل event loop هستیم پس asyncio قبلاً وارد شده؛ worker های همگام هزینه‌ی import آن را نمی‌دهند
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, fn, *args)
+
+    async def _offload_measured(self, normalize: str, sync: Callable[[RawResponse], List[T]],
+                                response_json: RawResponse) -> List[T]:
+        if self.executor is None or self.instrumentation is None:
+            return await self._offload(sync, response_json)
+        # worker (به‌خصوص در process pool) instrumentation ندارد؛ آمار برمی‌گردد و اینجا ثبت می‌شود
+        out, stats = await self._offload(self.measure_sync, normalize, response_json)
+        self.instrumentation.record(stats)
+        return out
+
+    async def adapt(self, response_json: RawResponse) -> List[BaseServiceModel]:
         """هر اداپتور باید لیستی از BaseServiceModel برگرداند"""
+        return await self._offload_measured("normalize", self.adapt_sync, response_json)
+
+    async def adapt_records(self, response_json: RawResponse) -> List[ServiceRecord]:
+        return await self._offload_measured("normalize_records", self.adapt_records_sync, response_json)
+
+    async def adapt_result(self, response_json: RawResponse) -> AdaptResult:
+        return await self._offload(self.adapt_result_sync, response_json)
+
+    async def adapt_batch(self, responses: Sequence[RawResponse]) -> List[List[BaseServiceModel]]:
+        """هر batch_size پاسخ در یک ارسال به executor؛ هزینه‌ی IPC سرشکن می‌شود"""
+        if self.executor is None:
+            return self.adapt_chunk_sync(responses)
+        import asyncio
+        chunks = [responses[i:i + self.batch_size] for i in range(0, len(responses), self.batch_size)]
+        if self.instrumentation is None:
+            results = await asyncio.gather(*(self._offload(self.adapt_chunk_sync, c) for c in chunks))
+            return [services for chunk in results for services in chunk]
+        measured = await asyncio.gather(*(self._offload(self.measure_chunk_sync, c) for c in chunks))
+        out = []
+        for chunk in measured:
+            for services, stats in chunk:
+                self.instrumentation.record(stats)
+                out.append(services)
+        return out
+
+    def normalize(self, data: Dict[str, Any]) -> List[BaseServiceModel]:
+        """تبدیل پاسخ پارس‌شده به لیست BaseServiceModel"""
+        return to_models(self.normalize_records(data), self.validate)
+
+    @abstractmethod
+    def normalize_records(self, data: Dict[str, Any]) -> List[ServiceRecord]:
         ...
 
+    def normalize_result(self, data: Dict[str, Any]) -> AdaptResult:
+        """رکوردها و جدول‌های جست‌وجو از همان دیکشنری پارس‌شده؛ پاسخ دوباره decode نمی‌شود
+
+        با projected=True جدول‌ها فقط وقتی پر می‌شوند که آداپتور با with_lookups=True ساخته شده باشد.
+        """
+        return AdaptResult(self.normalize_records(data))
+
+    async def adapt_many(self, responses: Iterable[Union[RawResponse, Dict[str, Any]]]
+                         ) -> AsyncIterator[List[BaseServiceModel]]:
+        """برای هر پاسخ (رشته، بایت یا دیکشنری پارس‌شده) یک لیست سرویس برمی‌گرداند"""
+        for response in responses:
+            if not isinstance(response, dict):
+                yield await self.adapt(response)
+            else:
+                yield await self._offload(self.normalize, response)
+
+    async def adapt_columns(self, responses: Iterable[Union[RawResponse, Dict[str, Any]]],
+                            columns: Optional[QuoteColumns] = None) -> QuoteColumns:
+        """پر کردن مستقیم خروجی ستونی بدون ساختن BaseServiceModel"""
+        if columns is None:
+            from columnar import QuoteColumns
+            columns = QuoteColumns()
+        for response in responses:
+            if isinstance(response, dict):
+                records = await self._offload(self.normalize_records, response)
+            else:
+                records = await self.adapt_records(response)
+            columns.add_response(records)
+        return columns
+
+    async def adapt_stream(self, fileobj: IO, chunk_size: int = DEFAULT_CHUNK_SIZE
+                           ) -> AsyncIterator[List[BaseServiceModel]]:
+        """خواندن تدریجی یک آرایه‌ی JSON یا فایل JSONL بدون بارگذاری کل فایل
+
+        با executor فقط نرمال‌سازی به pool می‌رود؛ خواندن و decode هر سند در همین thread
+        انجام می‌شود ولی بین سندها کنترل به event loop برمی‌گردد.
+        """
+        for data in iter_json_documents(fileobj, chunk_size):
+            yield await self._offload(self.normalize, data)
+
 
 class TapsiPriceAdapter(RideAdapter):
-    async def adapt(self, response_json: str) -> List[BaseServiceModel]:
-        data = json.loads(response_json)
-        out: List[BaseServiceModel] = []
+    provider = "tapsi"
+    default_dedup = LEGACY_KEEP_LAST_3
+    projection_paths = (
+        "data.categories[].title",
+        "data.categories[].items[].service.key",
+        "data.categories[].items[].service.prices[].passengerShare",
+        "data.ttl",
+    )
+    lookup_paths = ("data.token",)
+
+    def normalize_records(self, data: Dict[str, Any]) -> List[ServiceRecord]:
+        if self.dedup is LEGACY_KEEP_LAST_3:
+            return self._normalize_keep_last_3(data)
+        out: List[ServiceRecord] = []
 
         for cat in data.get("data", {}).get("categories", []):
             category_title = cat.get("title")
@@ -32,370 +284,113 @@ class TapsiPriceAdapter(RideAdapter):
                 srv = item.get("service", {})
                 srv_key = srv.get("key")
                 for p in srv.get("prices", []):
-                    out.append(BaseServiceModel(
+                    out.append(ServiceRecord(
                         provider="tapsi",
                         service_key=srv_key,
                         category=category_title,
-                        price=p.get("passengerShare"),
+                        price=_as_price(p.get("passengerShare")),
                         is_discounted=False,
                         discount_text=""
                     ))
 
-        # حذف موارد تکراری با price و نگه‌داشتن فقط ۳ تای آخر
-        unique_prices = {item.price: item for item in out}
-        return list(unique_prices.values())[-3:]
+        # حذف موارد تکراری با price و نگه‌داشتن فقط ۳ تای آخر (قابل تنظیم با dedup)
+        return self.dedup(out) if self.dedup is not None else out
+
+    @staticmethod
+    def _normalize_keep_last_3(data: Dict[str, Any]) -> List[ServiceRecord]:
+        """همان خروجی LEGACY_KEEP_LAST_3 با حذف تکراری در حین پیمایش
+
+        برای هر قیمت فقط آخرین (عنوان دسته، کلید سرویس) در یک dict نگه داشته می‌شود (ترتیب
+        اولین دیده شدن قیمت حفظ می‌شود) و ServiceRecord فقط برای ۳ قیمت آخر ساخته می‌شود.
+        """
+        seen: Dict[Any, Tuple[Any, Any]] = {}
+        for cat in (data.get("data") or _NO_DICT).get("categories") or _NO_LIST:
+            title = cat.get("title")
+            for item in cat.get("items") or _NO_LIST:
+                srv = item.get("service") or _NO_DICT
+                srv_key = srv.get("key")
+                for p in srv.get("prices") or _NO_LIST:
+                    seen[p.get("passengerShare")] = (title, srv_key)
+
+        out: List[ServiceRecord] = []
+        for price, (title, srv_key) in reversed(list(islice(reversed(seen.items()), 3))):
+            out.append(ServiceRecord(
+                "tapsi",
+                sys.intern(srv_key) if type(srv_key) is str else srv_key,
+                sys.intern(title) if type(title) is str else title,
+                _as_price(price),
+                False,
+                "",
+            ))
+        return out
+
+    def normalize_result(self, data: Dict[str, Any]) -> AdaptResult:
+        token = data.get("data", {}).get("token")
+        return AdaptResult(self.normalize_records(data), token_prices=token_prices(token, self.decoder))
 
 
 class SnappAdapter(RideAdapter):
-    async def adapt(self, response_json: str) -> List[BaseServiceModel]:
-        data = json.loads(response_json)
-        out: List[BaseServiceModel] = []
+    provider = "snapp"
+    projection_paths = (
+        "data.prices[].type",
+        "data.prices[].final",
+        "data.prices[].is_discounted_price",
+        "data.prices[].texts.discounted_price",
+        "data.prices[].raw_fare",
+        "data.prices[].is_surged",
+    )
+    lookup_paths = (
+        "data.waiting[].key",
+        "data.waiting[].price",
+    )
+
+    def normalize_records(self, data: Dict[str, Any]) -> List[ServiceRecord]:
+        out: List[ServiceRecord] = []
 
         for p in data.get("data", {}).get("prices", []):
-            out.append(BaseServiceModel(
+            out.append(ServiceRecord(
                 provider="snapp",
                 service_key=p.get("type"),
                 category=None,
-                price=p.get("final"),
+                price=_as_price(p.get("final")),
                 is_discounted=p.get("is_discounted_price"),
-                discount_text=p.get("texts", {}).get("discounted_price", "")
+                discount_text=p.get("texts", {}).get("discounted_price", ""),
+                raw_price=_as_price(p.get("raw_fare")),
+                is_surged=p.get("is_surged", False)
             ))
 
-        return out
+        return self.dedup(out) if self.dedup is not None else out
+
+    def normalize_result(self, data: Dict[str, Any]) -> AdaptResult:
+        waiting = data.get("data", {}).get("waiting")
+        tiers = WaitingTiers.from_items(waiting) if waiting is not None else None
+        return AdaptResult(self.normalize_records(data), waiting=tiers)
 
 
 # ----------- تست سریع -----------
 
 async def demo():
-    tapsi_raw = '''{
-      "result": "OK",
-      "data": {
-        "categories": [
-          {
-            "key": "SUGGESTION",
-            "title": "پیشنهادی",
-            "items": [
-              {
-                "service": {
-                  "key": "STANDARD",
-                  "prices": [{"type": "CERTAIN", "passengerShare": 65000}]
-                }
-              },
-              {
-                "service": {
-                  "key": "WAIT_AND_SAVE",
-                  "prices": [{"type": "CERTAIN", "passengerShare": 60000}]
-                }
-              },
-              {
-                "service": {
-                  "key": "PLUS",
-                  "prices": [{"type": "CERTAIN", "passengerShare": 85000}]
-                }
-              }
-            ]
-          },
-          {
-            "key": "NORMAL",
-            "title": "دربستی",
-            "items": [
-              {
-                "service": {
-                  "key": "STANDARD",
-                  "prices": [{"type": "CERTAIN", "passengerShare": 65000}]
-                }
-              },
-              {
-                "service": {
-                  "key": "PLUS",
-                  "prices": [{"type": "CERTAIN", "passengerShare": 85000}]
-                }
-              }
-            ]
-          },
-          {
-            "key": "ECONOMIC",
-            "title": "اقتصادی",
-            "items": [
-              {
-                "service": {
-                  "key": "WAIT_AND_SAVE",
-                  "prices": [{"type": "CERTAIN", "passengerShare": 60000}]
-                }
-              }
-            ]
-          }
-        ]
-      }
-    }'''  # paste actual string here
-    snapp_raw = '''{
-        "status": 200,
-        "data": {
-            "prices": [
-                {
-                    "final": 840000,
-                    "final_lower": null,
-                    "is_hurry_enable": true,
-                    "raw_fare": null,
-                    "raw_fare_lower": null,
-                    "type": "1",
-                    "is_free_ride": false,
-                    "is_discounted_price": false,
-                    "is_surged": false,
-                    "is_enabled": true,
-                    "is_post_price": false,
-                    "tag": "",
-                    "texts": {
-                        "free_ride": "",
-                        "free_ride_footer": "",
-                        "discounted_price": "تخفیف برای شما!",
-                        "discounted_price_footer": "تبریک، این سفر ۰٪ تخفیف دارد. از سفرتان لذت ببرید!",
-                        "surge": "",
-                        "surge_footer": "",
-                        "disabled_reason": "",
-                        "surge_link": null,
-                        "promotion_message": "",
-                        "promotion_message_footer": "",
-                        "discount_and_surge_price": "تخفیف برای افزایش قیمت موقت",
-                        "discount_and_surge_price_footer": "به دلیل بالا رفتن تقاضا، هزینه این سفر به طور موقت از سقف شورای شهر برای تاکسی تلفنی بیشتر است. همچنین این سرویس شامل ۰٪ تخفیف شده است.",
-                        "post_price": "",
-                        "post_price_footer": "",
-                        "priority_offer_button": "درخواست پیشتاز"
-                    },
-                    "distance": 0,
-                    "eta": "",
-                    "eta_texts": [
-                        "16:09"
-                    ],
-                    "items": [],
-                    "promotion_error": "",
-                    "voucher_type": 0,
-                    "tcv": "",
-                    "pickup_eta": "",
-                    "flexi": {
-                        "is_enabled": false,
-                        "config": {
-                            "open_dialogue_button": "",
-                            "title": "",
-                            "description": "",
-                            "confirm_button": "",
-                            "warning_message": ""
-                        },
-                        "prices": null
-                    }
-                },
-                {
-                    "final": 1000000,
-                    "final_lower": null,
-                    "is_hurry_enable": true,
-                    "raw_fare": 1110000,
-                    "raw_fare_lower": null,
-                    "type": "2",
-                    "is_free_ride": false,
-                    "is_discounted_price": true,
-                    "is_surged": false,
-                    "is_enabled": true,
-                    "is_post_price": false,
-                    "tag": "",
-                    "texts": {
-                        "free_ride": "",
-                        "free_ride_footer": "",
-                        "discounted_price": "تخفیف برای شما!",
-                        "discounted_price_footer": "تبریک، این سفر ۹٪ تخفیف دارد. از سفرتان لذت ببرید!",
-                        "surge": "",
-                        "surge_footer": "",
-                        "disabled_reason": "",
-                        "surge_link": null,
-                        "promotion_message": "",
-                        "promotion_message_footer": "",
-                        "discount_and_surge_price": "تخفیف برای افزایش قیمت موقت",
-                        "discount_and_surge_price_footer": "به دلیل بالا رفتن تقاضا، هزینه این سفر به طور موقت از سقف شورای شهر برای تاکسی تلفنی بیشتر است. همچنین این سرویس شامل ۹٪ تخفیف شده است.",
-                        "post_price": "",
-                        "post_price_footer": "",
-                        "priority_offer_button": "درخواست پیشتاز"
-                    },
-                    "distance": 0,
-                    "eta": "",
-                    "eta_texts": [
-                        "16:09"
-                    ],
-                    "items": [],
-                    "promotion_error": "",
-                    "voucher_type": 0,
-                    "tcv": "",
-                    "pickup_eta": "",
-                    "flexi": {
-                        "is_enabled": false,
-                        "config": {
-                            "open_dialogue_button": "",
-                            "title": "",
-                            "description": "",
-                            "confirm_button": "",
-                            "warning_message": ""
-                        },
-                        "prices": null
-                    }
-                }
-            ],
-            "tag": "0",
-            "confirm_before_ride": false,
-            "confirm_before_ride_message": "",
-            "waiting": [
-                {
-                    "key": "0m-5m",
-                    "price": 30000,
-                    "text": "۰ تا ۵ دقیقه"
-                },
-                {
-                    "key": "5m-10m",
-                    "price": 60000,
-                    "text": "۵ تا ۱۰ دقیقه"
-                },
-                {
-                    "key": "10m-15m",
-                    "price": 90000,
-                    "text": "۱۰ تا ۱۵ دقیقه"
-                },
-                {
-                    "key": "15m-20m",
-                    "price": 120000,
-                    "text": "۱۵ تا ۲۰ دقیقه"
-                },
-                {
-                    "key": "20m-25m",
-                    "price": 150000,
-                    "text": "۲۰ تا ۲۵ دقیقه"
-                },
-                {
-                    "key": "25m-30m",
-                    "price": 180000,
-                    "text": "۲۵ تا ۳۰ دقیقه"
-                },
-                {
-                    "key": "30m-45m",
-                    "price": 270000,
-                    "text": "۳۰ تا ۴۵ دقیقه"
-                },
-                {
-                    "key": "45m-1h",
-                    "price": 360000,
-                    "text": "۴۵ دقیقه تا ۱ ساعت"
-                },
-                {
-                    "key": "1h-1h30m",
-                    "price": 540000,
-                    "text": "۱ تا ۱.۵ ساعت"
-                },
-                {
-                    "key": "1h30m-2h",
-                    "price": 720000,
-                    "text": "۱.۵ تا ۲ ساعت"
-                },
-                {
-                    "key": "2h-2h30m",
-                    "price": 900000,
-                    "text": "۲ تا ۲.۵ ساعت"
-                },
-                {
-                    "key": "2h30m-3h",
-                    "price": 1080000,
-                    "text": "۲.۵ تا ۳ ساعت"
-                },
-                {
-                    "key": "3h-3h30m",
-                    "price": 1260000,
-                    "text": "۳ تا ۳.۵ ساعت"
-                },
-                {
-                    "key": "3h30m-4h",
-                    "price": 1440000,
-                    "text": "۳.۵ تا ۴ ساعت"
-                },
-                {
-                    "key": "0m-5m",
-                    "price": 30000,
-                    "text": "۰ تا ۵ دقیقه"
-                },
-                {
-                    "key": "5m-10m",
-                    "price": 60000,
-                    "text": "۵ تا ۱۰ دقیقه"
-                },
-                {
-                    "key": "10m-15m",
-                    "price": 90000,
-                    "text": "۱۰ تا ۱۵ دقیقه"
-                },
-                {
-                    "key": "15m-20m",
-                    "price": 120000,
-                    "text": "۱۵ تا ۲۰ دقیقه"
-                },
-                {
-                    "key": "20m-25m",
-                    "price": 150000,
-                    "text": "۲۰ تا ۲۵ دقیقه"
-                },
-                {
-                    "key": "25m-30m",
-                    "price": 180000,
-                    "text": "۲۵ تا ۳۰ دقیقه"
-                },
-                {
-                    "key": "30m-45m",
-                    "price": 270000,
-                    "text": "۳۰ تا ۴۵ دقیقه"
-                },
-                {
-                    "key": "45m-1h",
-                    "price": 360000,
-                    "text": "۴۵ دقیقه تا ۱ ساعت"
-                },
-                {
-                    "key": "1h-1h30m",
-                    "price": 540000,
-                    "text": "۱ تا ۱.۵ ساعت"
-                },
-                {
-                    "key": "1h30m-2h",
-                    "price": 720000,
-                    "text": "۱.۵ تا ۲ ساعت"
-                },
-                {
-                    "key": "2h-2h30m",
-                    "price": 900000,
-                    "text": "۲ تا ۲.۵ ساعت"
-                },
-                {
-                    "key": "2h30m-3h",
-                    "price": 1080000,
-                    "text": "۲.۵ تا ۳ ساعت"
-                },
-                {
-                    "key": "3h-3h30m",
-                    "price": 1260000,
-                    "text": "۳ تا ۳.۵ ساعت"
-                },
-                {
-                    "key": "3h30m-4h",
-                    "price": 1440000,
-                    "text": "۳.۵ تا ۴ ساعت"
-                }
-            ],
-            "details": null
-        }
-    }'''  # paste actual string here
-
-    tapsi_adapter = TapsiPriceAdapter()
-    snapp_adapter = SnappAdapter()
-
-    tapsi_res = await tapsi_adapter.adapt(tapsi_raw)
-    snapp_res = await snapp_adapter.adapt(snapp_raw)
-
-    unified: List[BaseServiceModel] = tapsi_res + snapp_res
+    from aggregator import QuoteAggregator
+    from fixtures import load
+
+    tapsi_raw = load("tapsi_small.json")
+    snapp_raw = load("snapp.json")
+
+    async def fetch_tapsi():
+        return tapsi_raw
+
+    async def fetch_snapp():
+        return snapp_raw
+
+    aggregator = QuoteAggregator()
+    aggregator.register("tapsi", TapsiPriceAdapter(), fetch_tapsi)
+    aggregator.register("snapp", SnappAdapter(), fetch_snapp)
+
+    unified: List[BaseServiceModel] = await aggregator.quote()
     for item in unified:
         print(json.dumps(item.model_dump(), ensure_ascii=False, indent=2))
 
 
 if __name__ == "__main__":
+    import asyncio
     asyncio.run(demo())
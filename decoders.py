@@ -0,0 +1,133 @@
+import functools
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+RawResponse = Union[str, bytes, bytearray, memoryview]
+
+
+class JsonDecoder:
+    """دیکودر پیش‌فرض با json استاندارد پایتون"""
+    name = "json"
+
+    def loads(self, raw: RawResponse) -> Any:
+        if isinstance(raw, memoryview):
+            raw = raw.tobytes()
+        return json.loads(raw)
+
+
+class OrjsonDecoder(JsonDecoder):
+    name = "orjson"
+
+    def loads(self, raw: RawResponse) -> Any:
+        return orjson.loads(raw)
+
+
+class MsgspecDecoder(JsonDecoder):
+    name = "msgspec"
+
+    def loads(self, raw: RawResponse) -> Any:
+        return msgspec.json.decode(raw)
+
+
+BACKENDS: Dict[str, Type[JsonDecoder]] = {
+    "orjson": OrjsonDecoder,
+    "msgspec": MsgspecDecoder,
+    "json": JsonDecoder,
+}
+
+_AVAILABLE = {
+    "orjson": orjson is not None,
+    "msgspec": msgspec is not None,
+    "json": True,
+}
+
+
+def get_decoder(name: Optional[str] = None) -> JsonDecoder:
+    """اگر نام داده نشود سریع‌ترین بک‌اند نصب‌شده انتخاب می‌شود"""
+    if name is None:
+        name = next(n for n in BACKENDS if _AVAILABLE[n])
+    if name not in BACKENDS:
+        raise ValueError(f"unknown JSON backend: {name!r}")
+    if not _AVAILABLE[name]:
+        raise ImportError(f"JSON backend {name!r} is not installed")
+    return BACKENDS[name]()
+
+
+def _compile_paths(paths: Iterable[str]) -> Dict[str, Any]:
+    # "data.prices[].texts.discounted_price" -> {"data": {"prices": [{"texts": {...}}]}}
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        parts = path.split(".")
+        for i, part in enumerate(parts):
+            is_list = part.endswith("[]")
+            name = part[:-2] if is_list else part
+            last = i == len(parts) - 1
+            if last:
+                node.setdefault(name, None)
+                break
+            child = node.get(name)
+            if child is None:
+                child = [{}] if is_list else {}
+                node[name] = child
+            node = child[0] if isinstance(child, list) else child
+    return tree
+
+
+def _build_struct(tree: Dict[str, Any], name: str) -> type:
+    fields = []
+    rename = {}
+    for i, (key, child) in enumerate(tree.items()):
+        if child is None:
+            tp = Any
+        elif isinstance(child, list):
+            tp = Optional[List[_build_struct(child[0], f"{name}_{i}")]]
+        else:
+            tp = Optional[_build_struct(child, f"{name}_{i}")]
+        field = f"f{i}"
+        rename[field] = key
+        fields.append((field, Union[tp, msgspec.UnsetType], msgspec.UNSET))
+    return msgspec.defstruct(name, fields, rename=rename)
+
+
+@functools.lru_cache(maxsize=None)
+def _projection_decoder(paths: Tuple[str, ...]) -> "msgspec.json.Decoder":
+    # ساختن Structها گران است؛ هر process برای هر مجموعه مسیر فقط یک بار می‌سازد
+    # (مهم برای ProcessPoolExecutor که آداپتور را در هر فراخوانی unpickle می‌کند)
+    return msgspec.json.Decoder(_build_struct(_compile_paths(paths), "Projection"))
+
+
+class Projection:
+    """پارس فقط مسیرهای لازم؛ زیردرخت‌های دیگر اصلاً به شیء پایتون تبدیل نمی‌شوند
+
+    بدون msgspec همان پارس کامل انجام می‌شود و خروجی معادل است.
+    """
+
+    def __init__(self, *paths: str, fallback: Optional[JsonDecoder] = None):
+        self.paths: Tuple[str, ...] = paths
+        self.fallback = fallback or get_decoder()
+        self._decoder = None
+        if msgspec is not None:
+            self._decoder = _projection_decoder(paths)
+
+    def loads(self, raw: RawResponse) -> Any:
+        if self._decoder is None:
+            return self.fallback.loads(raw)
+        try:
+            return msgspec.to_builtins(self._decoder.decode(raw))
+        except msgspec.ValidationError:
+            # شکل غیرمنتظره؛ مثل قبل پارس کامل و رفتار .get() آداپتور
+            return self.fallback.loads(raw)
+
+    def __reduce__(self):
+        return functools.partial(self.__class__, fallback=self.fallback), self.paths
@@ -0,0 +1,100 @@
+import heapq
+from collections import OrderedDict
+from operator import attrgetter
+from typing import Any, Callable, Hashable, Iterable, List, Optional
+
+KEEP = ("first", "last")
+ORDER = ("first_seen", "last_seen")
+SELECT = ("first", "last", "cheapest")
+
+
+class Deduplicator:
+    """حذف تکراری‌ها و انتخاب K مورد در یک گذر
+
+    key: کلید تکراری بودن (None یعنی بدون حذف تکراری)
+    keep: از موارد هم‌کلید کدام مقدار بماند (first/last)
+    order: ترتیب خروجی بر اساس اولین یا آخرین دیده شدن کلید
+    select: K مورد اول، آخر یا ارزان‌ترین؛ k=None یعنی همه
+
+    حالت‌های last/last_seen/last و first/first_seen/first فقط O(K) حافظه می‌گیرند؛
+    بقیه به اندازه‌ی تعداد کلیدهای یکتا حافظه لازم دارند.
+    """
+
+    def __init__(self, key: Optional[Callable[[Any], Hashable]] = attrgetter("price"),
+                 keep: str = "last", order: str = "first_seen", select: str = "last",
+                 k: Optional[int] = 3, price: Callable[[Any], float] = attrgetter("price")):
+        if keep not in KEEP or order not in ORDER or select not in SELECT:
+            raise ValueError(f"invalid dedup mode: keep={keep!r} order={order!r} select={select!r}")
+        self.key = key
+        self.keep = keep
+        self.order = order
+        self.select = select
+        self.k = k
+        self.price = price
+
+    def __call__(self, items: Iterable[Any]) -> List[Any]:
+        if self.key is None:
+            return self._select(list(items))
+        if self.select == "last" and self.keep == "last" and self.order == "last_seen" and self.k is not None:
+            return self._last_k(items)
+        if self.select == "first" and self.keep == "first" and self.order == "first_seen" and self.k is not None:
+            return self._first_k(items)
+
+        key = self.key
+        seen: "OrderedDict[Hashable, Any]" = OrderedDict()
+        if self.keep == "first":
+            for item in items:
+                k = key(item)
+                if k not in seen:
+                    seen[k] = item
+                elif self.order == "last_seen":
+                    seen.move_to_end(k)
+        elif self.order == "first_seen":
+            for item in items:
+                seen[key(item)] = item
+        else:
+            for item in items:
+                k = key(item)
+                seen[k] = item
+                seen.move_to_end(k)
+        return self._select(list(seen.values()))
+
+    def _select(self, values: List[Any]) -> List[Any]:
+        if self.k is None:
+            return values
+        if self.select == "cheapest":
+            return heapq.nsmallest(self.k, values, key=self.price)
+        if self.select == "first":
+            return values[:self.k]
+        return values[-self.k:] if self.k else []
+
+    def _last_k(self, items: Iterable[Any]) -> List[Any]:
+        # کلیدی که از پنجره بیرون می‌افتد اگر دوباره بیاید آخرین رخدادش بعدتر است، پس حذفش درست است
+        key, k = self.key, self.k
+        window: "OrderedDict[Hashable, Any]" = OrderedDict()
+        for item in items:
+            kk = key(item)
+            window[kk] = item
+            window.move_to_end(kk)
+            if len(window) > k:
+                window.popitem(last=False)
+        return list(window.values())
+
+    def _first_k(self, items: Iterable[Any]) -> List[Any]:
+        key, k = self.key, self.k
+        out: List[Any] = []
+        seen = set()
+        if not k:
+            return out
+        for item in items:
+            kk = key(item)
+            if kk not in seen:
+                seen.add(kk)
+                out.append(item)
+                if len(out) == k:
+                    break
+        return out
+
+
+# رفتار قبلی: کلید قیمت، مقدار آخر، ترتیب اولین دیده شدن، ۳ تای آخر
+LEGACY_KEEP_LAST_3 = Deduplicator()
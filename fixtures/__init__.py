@@ -0,0 +1,12 @@
+import os
+from functools import lru_cache
+
+FIXTURES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@lru_cache(maxsize=None)
+def load(name: str) -> str:
+    """متن خام یک پاسخ نمونه از همین پوشه؛ فقط با اولین درخواست از دیسک خوانده می‌شود"""
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
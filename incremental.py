@@ -0,0 +1,122 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+from config import RideAdapter, ServiceRecord
+from decoders import Projection, RawResponse
+from trips import trip_key_from_response
+
+ServiceId = Tuple[Optional[str], Optional[str], int]
+
+# مسیرهایی که trip_key_from_response می‌خواند؛ به projection آداپتور اضافه می‌شوند
+TRIP_PATHS = (
+    "data.origin.location.latitude",
+    "data.origin.location.longitude",
+    "data.destinations[].location.latitude",
+    "data.destinations[].location.longitude",
+    "data.hasReturn",
+    "data.waitingTime",
+)
+
+
+class QuoteDiff(NamedTuple):
+    key: Hashable
+    # سرویس‌های تازه یا تغییرکرده
+    changed: List[ServiceRecord]
+    # سرویس‌هایی که در پاسخ قبلی بودند و حالا نیستند (آخرین مقدار دیده‌شده)
+    removed: List[ServiceRecord]
+    unchanged: int
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.removed)
+
+
+def _service_ids(records: Iterable[ServiceRecord]) -> Iterable[Tuple[ServiceId, ServiceRecord]]:
+    # یک سرویس ممکن است در یک دسته چند قیمت داشته باشد؛ شماره‌ی تکرار جزء شناسه است
+    seen: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+    for r in records:
+        base = (r.service_key, r.category)
+        n = seen.get(base, 0)
+        seen[base] = n + 1
+        yield (r.service_key, r.category, n), r
+
+
+def _state(r: ServiceRecord) -> Tuple[Any, ...]:
+    return r.price, r.raw_price, r.is_discounted, r.is_surged
+
+
+class IncrementalAdapter:
+    """برای هر سفر آخرین نتیجه را نگه می‌دارد و فقط سرویس‌های تغییرکرده را برمی‌گرداند
+
+    تغییر یعنی جابه‌جایی price/raw_price یا عوض شدن is_discounted/is_surged؛ متن‌ها مقایسه نمی‌شوند.
+    حداکثر max_trips سفر نگه داشته می‌شود و قدیمی‌ترین (LRU) کنار می‌رود.
+    """
+
+    def __init__(self, adapter: RideAdapter, max_trips: int = 10_000, precision: int = 4):
+        self.adapter = adapter
+        self.max_trips = max_trips
+        self.precision = precision
+        self._projection: Optional[Projection] = None
+        if adapter.projection is not None:
+            self._projection = Projection(*adapter.projection.paths, *TRIP_PATHS, fallback=adapter.decoder)
+        self._last: "OrderedDict[Hashable, Dict[ServiceId, ServiceRecord]]" = OrderedDict()
+        self.responses = 0
+        self.emitted = 0
+        self.suppressed = 0
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "adapter":
+            raise AttributeError(name)
+        return getattr(self.adapter, name)
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+    def diff(self, key: Hashable, records: Iterable[ServiceRecord]) -> QuoteDiff:
+        previous = self._last.pop(key, None) or {}
+        current: Dict[ServiceId, ServiceRecord] = {}
+        changed: List[ServiceRecord] = []
+        for sid, r in _service_ids(records):
+            current[sid] = r
+            old = previous.pop(sid, None)
+            if old is None or _state(old) != _state(r):
+                changed.append(r)
+        self._last[key] = current
+        if len(self._last) > self.max_trips:
+            self._last.popitem(last=False)
+
+        removed = list(previous.values())
+        unchanged = len(current) - len(changed)
+        self.responses += 1
+        self.emitted += len(changed) + len(removed)
+        self.suppressed += unchanged
+        return QuoteDiff(key, changed, removed, unchanged)
+
+    async def adapt_diff(self, response_json: RawResponse, key: Optional[Hashable] = None) -> QuoteDiff:
+        """بدون key، کلید سفر از origin/destinations خود پاسخ ساخته می‌شود (پاسخ تپسی)"""
+        if key is not None:
+            return self.diff(key, await self.adapter.adapt_records(response_json))
+        if self._projection is not None:
+            data = self._projection.loads(response_json)
+        else:
+            data = self.adapter.parse(response_json)
+        try:
+            key = trip_key_from_response(data, self.precision)
+        except (KeyError, TypeError):
+            raise ValueError(f"{self.adapter.provider} response has no trip origin; pass key=") from None
+        return self.diff(key, self.adapter.normalize_records(data))
+
+    def forget(self, key: Hashable) -> None:
+        self._last.pop(key, None)
+
+    def clear(self) -> None:
+        self._last.clear()
+
+    def stats(self) -> dict:
+        total = self.emitted + self.suppressed
+        return {
+            "responses": self.responses,
+            "trips": len(self._last),
+            "emitted": self.emitted,
+            "suppressed": self.suppressed,
+            "emit_ratio": self.emitted / total if total else 0.0,
+        }
@@ -0,0 +1,123 @@
+import os
+import threading
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+SECONDS_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1)
+BYTES_BUCKETS = (512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class AdaptStats(NamedTuple):
+    provider: str
+    parse_seconds: float
+    normalize_seconds: float
+    payload_bytes: int
+    services: int
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        out = []
+        total = 0
+        for bound, n in zip(self.buckets, self.counts):
+            total += n
+            out.append((repr(float(bound)), total))
+        out.append(("+Inf", total + self.counts[-1]))
+        return out
+
+
+_METRICS = {
+    "parse_seconds": ("ride_adapter_parse_seconds", "Time spent decoding the response", SECONDS_BUCKETS),
+    "normalize_seconds": ("ride_adapter_normalize_seconds", "Time spent normalizing services", SECONDS_BUCKETS),
+    "payload_bytes": ("ride_adapter_payload_bytes", "Size of the raw response", BYTES_BUCKETS),
+    "services": ("ride_adapter_services", "Services emitted per adapt call", COUNT_BUCKETS),
+}
+
+
+class Instrumentation:
+    """هیستوگرام‌های درون‌پردازه‌ای برای هر فراخوانی adapt
+
+    آداپتوری که instrumentation ندارد هیچ هزینه‌ای جز یک بررسی None نمی‌پردازد.
+    hookها هر AdaptStats را هم دریافت می‌کنند (مثلاً برای لاگ یا exporter دیگر).
+    """
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+        self.hooks: List[Callable[[AdaptStats], None]] = []
+
+    def _histogram(self, metric: str, provider: str) -> Histogram:
+        key = (metric, provider)
+        h = self._histograms.get(key)
+        if h is None:
+            with self._lock:
+                h = self._histograms.setdefault(key, Histogram(_METRICS[metric][2]))
+        return h
+
+    def record(self, stats: AdaptStats) -> None:
+        for metric in _METRICS:
+            self._histogram(metric, stats.provider).observe(getattr(stats, metric))
+        for hook in self.hooks:
+            hook(stats)
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for metric, (name, help_text, _) in _METRICS.items():
+            series = sorted((p, h) for (m, p), h in list(self._histograms.items()) if m == metric)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for provider, h in series:
+                label = f'provider="{provider}"'
+                for le, n in h.cumulative():
+                    lines.append(f'{name}_bucket{{{label},le="{le}"}} {n}')
+                lines.append(f"{name}_sum{{{label}}} {h.sum}")
+                lines.append(f"{name}_count{{{label}}} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        # برای node_exporter textfile collector؛ جایگزینی اتمیک فایل
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp, path)
+
+    def serve_prometheus(self, port: int = 9108, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        instrumentation = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = instrumentation.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
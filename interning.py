@@ -0,0 +1,107 @@
+import sys
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from config import ServiceRecord
+
+
+class StringTable:
+    """جدول رشته <-> کد عددی؛ کد 0 همیشه None است
+
+    لایه‌ی مشترک کدگذاری رشته‌ها در QuoteCodec، QuoteColumns و لاگ قیمت.
+    """
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[Optional[str]] = [None]
+        self._codes: Dict[Optional[str], int] = {None: 0}
+        for value in values:
+            self.encode(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, value: Optional[str]) -> bool:
+        return value in self._codes
+
+    def encode(self, value: Optional[str]) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(sys.intern(value) if type(value) is str else value)
+        return code
+
+    def decode(self, code: int) -> Optional[str]:
+        return self.values[code]
+
+    def code(self, value: Optional[str]) -> Optional[int]:
+        """کد بدون افزودن؛ برای فیلتر کردن روی کدها"""
+        return self._codes.get(value)
+
+
+class CompactQuote(NamedTuple):
+    """ServiceRecord با کد عددی به جای رشته‌ها؛ رشته‌ها فقط یک بار در QuoteCodec نگه داشته می‌شوند"""
+    provider_code: int
+    service_code: int
+    category_code: int
+    price: float
+    is_discounted: bool
+    discount_code: int
+    raw_price: Optional[float] = None
+    is_surged: bool = False
+
+
+class QuoteCodec:
+    """تبدیل ServiceRecord به CompactQuote و برعکس
+
+    متن‌های فارسی تخفیف و عنوان دسته‌ها در هزاران پاسخ عیناً تکرار می‌شوند؛ اینجا هر کدام
+    یک بار ذخیره می‌شوند و رکورد فقط کد آن را دارد. رمزگشایی فقط هنگام خواندن انجام می‌شود.
+    """
+
+    def __init__(self, providers: Iterable[str] = ("tapsi", "snapp")):
+        self.providers = StringTable(providers)
+        self.services = StringTable()
+        self.categories = StringTable()
+        self.texts = StringTable()
+
+    def encode(self, r: Any) -> CompactQuote:
+        """r می‌تواند ServiceRecord یا BaseServiceModel باشد"""
+        return CompactQuote(
+            self.providers.encode(r.provider),
+            self.services.encode(r.service_key),
+            self.categories.encode(r.category),
+            r.price,
+            r.is_discounted,
+            self.texts.encode(r.discount_text),
+            r.raw_price,
+            r.is_surged,
+        )
+
+    def encode_many(self, records: Iterable[Any]) -> List[CompactQuote]:
+        return [self.encode(r) for r in records]
+
+    def decode(self, q: CompactQuote) -> "ServiceRecord":
+        # config فقط هنگام رمزگشایی لازم است؛ StringTable بدون بار import آن قابل استفاده است
+        from config import ServiceRecord
+        return ServiceRecord(
+            self.providers.values[q.provider_code],
+            self.services.values[q.service_code],
+            self.categories.values[q.category_code],
+            q.price,
+            q.is_discounted,
+            self.texts.values[q.discount_code],
+            q.raw_price,
+            q.is_surged,
+        )
+
+    def decode_many(self, quotes: Iterable[CompactQuote]) -> List["ServiceRecord"]:
+        return [self.decode(q) for q in quotes]
+
+    def table_bytes(self) -> int:
+        """حافظه‌ی تقریبی جدول‌ها (رشته‌ها + دیکشنری‌ها)"""
+        size = 0
+        for table in (self.providers, self.services, self.categories, self.texts):
+            size += sys.getsizeof(table.values) + sys.getsizeof(table._codes)
+            size += sum(sys.getsizeof(v) for v in table.values if v is not None)
+        return size
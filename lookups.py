@@ -0,0 +1,120 @@
+import base64
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional
+
+from decoders import JsonDecoder
+
+
+def duration_minutes(text: str) -> int:
+    """"3h30m" -> 210، "45m" -> 45، "1h" -> 60"""
+    hours, sep, rest = text.partition("h")
+    if not sep:
+        hours, rest = "0", text
+    minutes = rest[:-1] if rest.endswith("m") else rest
+    return int(hours or 0) * 60 + int(minutes or 0)
+
+
+class WaitingTier(NamedTuple):
+    start: int
+    end: int
+    price: float
+    key: str
+
+
+class WaitingTiers:
+    """جدول هزینه‌ی انتظار اسنپ به صورت آرایه‌های مرتب؛ جست‌وجو با bisect در O(log n)
+
+    هر بازه شامل انتهای خودش است: ۵ دقیقه انتظار در بازه‌ی 0m-5m حساب می‌شود.
+    بازه‌های تکراری پاسخ فقط یک بار نگه داشته می‌شوند.
+    """
+
+    __slots__ = ("starts", "ends", "prices", "keys")
+
+    def __init__(self, tiers: Iterable[WaitingTier] = ()):
+        unique = sorted({(t.end, t.start): t for t in tiers}.values(), key=lambda t: (t.end, t.start))
+        self.starts = array("I", [t.start for t in unique])
+        self.ends = array("I", [t.end for t in unique])
+        self.prices = array("d", [t.price for t in unique])
+        self.keys: List[str] = [t.key for t in unique]
+
+    @classmethod
+    def from_items(cls, items: Iterable[Mapping[str, Any]]) -> "WaitingTiers":
+        """از فهرست waiting پاسخ: [{"key": "0m-5m", "price": 30000, ...}, ...]"""
+        tiers = []
+        for item in items:
+            key = item.get("key")
+            price = item.get("price")
+            if not key or price is None:
+                continue
+            start, _, end = key.partition("-")
+            try:
+                tiers.append(WaitingTier(duration_minutes(start), duration_minutes(end), float(price), key))
+            except ValueError:
+                continue
+        return cls(tiers)
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    def __iter__(self) -> Iterator[WaitingTier]:
+        return map(WaitingTier, self.starts, self.ends, self.prices, self.keys)
+
+    def _index(self, minutes: float) -> int:
+        i = bisect_left(self.ends, minutes)
+        if minutes < 0 or i == len(self.ends) or minutes < self.starts[i]:
+            return -1
+        return i
+
+    def price_for(self, minutes: float) -> Optional[float]:
+        """هزینه‌ی انتظار برای این تعداد دقیقه؛ بیرون از بازه‌ها None"""
+        i = self._index(minutes)
+        return self.prices[i] if i >= 0 else None
+
+    def tier_for(self, minutes: float) -> Optional[WaitingTier]:
+        i = self._index(minutes)
+        return WaitingTier(self.starts[i], self.ends[i], self.prices[i], self.keys[i]) if i >= 0 else None
+
+    @property
+    def max_minutes(self) -> int:
+        return self.ends[-1] if self.ends else 0
+
+    def __repr__(self) -> str:
+        return f"WaitingTiers({len(self)} tiers, up to {self.max_minutes}m)"
+
+
+def jwt_payload(token: Any, decoder: JsonDecoder) -> Dict[str, Any]:
+    """بخش payload یک JWT بدون بررسی امضا؛ فقط برای خواندن داده‌ای که خود سرویس‌دهنده فرستاده"""
+    if not isinstance(token, str):
+        raise ValueError("not a JWT")
+    parts = token.split(".")
+    if len(parts) != 3:
+        raise ValueError("not a JWT")
+    payload = parts[1]
+    return decoder.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+
+
+def token_prices(token: Any, decoder: JsonDecoder) -> Optional[Dict[str, float]]:
+    """serviceKey -> passengerShare از priceData داخل توکن تپسی؛ توکن خراب یا غایب None"""
+    if not token:
+        return None
+    try:
+        payload = jwt_payload(token, decoder)
+    except ValueError:
+        return None
+    price_data = payload.get("priceData") if isinstance(payload, dict) else None
+    if not isinstance(price_data, list):
+        return None
+    prices: Dict[str, float] = {}
+    for p in price_data:
+        if not isinstance(p, dict):
+            return None
+        key = p.get("serviceKey")
+        share = p.get("passengerShare")
+        # اولین ورودی هر سرویس (کمترین تعداد مسافر در پاسخ‌های فعلی) نگه داشته می‌شود
+        if key is not None and share is not None and key not in prices:
+            try:
+                prices[key] = float(share)
+            except (TypeError, ValueError):
+                return None
+    return prices
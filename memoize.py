@@ -0,0 +1,77 @@
+import hashlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, List, Tuple
+
+from config import RideAdapter, ServiceRecord, to_models
+from decoders import RawResponse
+
+if TYPE_CHECKING:
+    from models import BaseServiceModel
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+def content_hash(raw: RawResponse) -> Tuple[bytes, int]:
+    """هش غیررمزنگارانه‌ی سریع روی بایت‌های خام پاسخ (xxhash در صورت نصب بودن)"""
+    if isinstance(raw, str):
+        raw = raw.encode()
+    if xxhash is not None:
+        digest = xxhash.xxh3_128_digest(raw)
+    else:
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+    return digest, len(raw)
+
+
+class MemoizedAdapter:
+    """پاسخ‌های بایت‌به‌بایت یکسان دوباره پارس نمی‌شوند
+
+    رکوردهای تغییرناپذیر ServiceRecord کش می‌شوند و هر بار BaseServiceModel تازه ساخته می‌شود
+    تا فراخواننده‌ها مدل مشترک را تغییر ندهند.
+    """
+
+    def __init__(self, adapter: RideAdapter, maxsize: int = 1024):
+        self.adapter = adapter
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[Tuple[bytes, int], Tuple[ServiceRecord, ...]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "adapter":
+            raise AttributeError(name)
+        return getattr(self.adapter, name)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    async def adapt_records(self, response_json: RawResponse) -> List[ServiceRecord]:
+        key = content_hash(response_json)
+        records = self._cache.get(key)
+        if records is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return list(records)
+        self.misses += 1
+        records = tuple(await self.adapter.adapt_records(response_json))
+        self._cache[key] = records
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return list(records)
+
+    async def adapt(self, response_json: RawResponse) -> List["BaseServiceModel"]:
+        return to_models(await self.adapt_records(response_json), self.adapter.validate)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        self._cache.clear()
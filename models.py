@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class BaseServiceModel(BaseModel):
+    provider: str
+    service_key: str
+    category: Optional[str] = None
+    price: float
+    is_discounted: bool
+    discount_text: Optional[str] = None
+    raw_price: Optional[float] = None
+    is_surged: bool = False
@@ -0,0 +1,160 @@
+import asyncio
+import os
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from config import ServiceRecord
+
+if TYPE_CHECKING:
+    from models import BaseServiceModel
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+Quote = Union[ServiceRecord, "BaseServiceModel"]
+
+COLUMNS = ("created_at", "provider", "service_key", "category", "price",
+           "is_discounted", "discount_text", "raw_price")
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS {table} (
+    created_at    timestamptz NOT NULL,
+    provider      text NOT NULL,
+    service_key   text,
+    category      text,
+    price         double precision,
+    is_discounted boolean,
+    discount_text text,
+    raw_price     double precision
+)
+"""
+
+
+def load_env(path: str = ".env") -> Dict[str, str]:
+    """خواندن .env ساده (KEY=VALUE)؛ متغیرهای محیطی واقعی اولویت دارند"""
+    values: Dict[str, str] = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#") and "=" in line:
+                    key, value = line.split("=", 1)
+                    values[key.strip()] = value.strip().strip("'\"")
+    values.update({k: v for k, v in os.environ.items() if k.startswith("DB_")})
+    return values
+
+
+def db_settings(env_path: str = ".env") -> Dict[str, Any]:
+    env = load_env(env_path)
+    return {
+        "host": env.get("DB_HOST", "localhost"),
+        "port": int(env.get("DB_PORT", 5432)),
+        "user": env.get("DB_USER", "postgres"),
+        "password": env.get("DB_PASSWORD"),
+        "database": env.get("DB_NAME", "postgres"),
+    }
+
+
+class QuoteSink:
+    """ذخیره‌ی دسته‌ای قیمت‌ها در PostgreSQL با COPY باینری
+
+    put() رکوردها را در بافر می‌گذارد؛ هر batch_size رکورد یا هر flush_interval ثانیه
+    یک COPY انجام می‌شود. اگر بافر به max_buffer برسد put() منتظر می‌ماند (backpressure).
+    """
+
+    def __init__(self, pool: Optional["asyncpg.Pool"] = None, table: str = "quotes",
+                 batch_size: int = 5000, flush_interval: float = 1.0, max_buffer: int = 50_000,
+                 env_path: str = ".env", min_pool_size: int = 1, max_pool_size: int = 4):
+        self.pool = pool
+        self.table = table
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.env_path = env_path
+        self.min_pool_size = min_pool_size
+        self.max_pool_size = max_pool_size
+        self._owns_pool = pool is None
+        self._buffer: List[Tuple[Any, ...]] = []
+        self._space = asyncio.Condition()
+        self._wakeup = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._closing = False
+        self.written = 0
+        self.flushes = 0
+        self.last_error: Optional[BaseException] = None
+
+    async def start(self, create_table: bool = False) -> "QuoteSink":
+        if self.pool is None:
+            if asyncpg is None:
+                raise ImportError("asyncpg is required for QuoteSink")
+            self.pool = await asyncpg.create_pool(
+                min_size=self.min_pool_size, max_size=self.max_pool_size, **db_settings(self.env_path))
+        if create_table:
+            async with self.pool.acquire() as conn:
+                await conn.execute(CREATE_TABLE_SQL.format(table=self.table))
+        self._flusher = asyncio.create_task(self._run())
+        return self
+
+    async def __aenter__(self) -> "QuoteSink":
+        return await self.start()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    @staticmethod
+    def _row(q: Quote, now: datetime) -> Tuple[Any, ...]:
+        return (now, q.provider, q.service_key, q.category, q.price,
+                q.is_discounted, q.discount_text, q.raw_price)
+
+    async def put(self, quotes: Iterable[Quote]) -> None:
+        now = datetime.now(timezone.utc)
+        rows = [self._row(q, now) for q in quotes]
+        async with self._space:
+            await self._space.wait_for(lambda: len(self._buffer) < self.max_buffer or self._closing)
+            self._buffer.extend(rows)
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        async with self._space:
+            rows, self._buffer = self._buffer, []
+        if not rows:
+            return
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.copy_records_to_table(self.table, records=rows, columns=COLUMNS)
+        except Exception as e:
+            # سطرها برمی‌گردند تا در flush بعدی دوباره فرستاده شوند
+            self.last_error = e
+            async with self._space:
+                self._buffer[:0] = rows
+            raise
+        self.written += len(rows)
+        self.flushes += 1
+        async with self._space:
+            self._space.notify_all()
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                await asyncio.sleep(self.flush_interval)
+
+    async def close(self) -> None:
+        self._closing = True
+        self._wakeup.set()
+        if self._flusher is not None:
+            await self._flusher
+        await self.flush()
+        async with self._space:
+            self._space.notify_all()
+        if self._owns_pool and self.pool is not None:
+            await self.pool.close()
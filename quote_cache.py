@@ -0,0 +1,121 @@
+import sys
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, List, NamedTuple, Optional, Sequence
+
+from coalescing import SingleFlight
+from config import RideAdapter, to_models
+from interning import QuoteCodec
+from trips import Fetch, Location, TripKey, trip_key, trip_key_from_response  # noqa: F401
+
+if TYPE_CHECKING:
+    from models import BaseServiceModel
+
+
+def _estimate_size(services: Sequence[Any]) -> int:
+    # برای CompactQuote رشته‌ها در جدول codec هستند و اینجا فقط کدها شمرده می‌شوند
+    size = sys.getsizeof(services)
+    for s in services:
+        values = s.__dict__.values() if hasattr(s, "__dict__") else s
+        size += sys.getsizeof(s) + sum(sys.getsizeof(v) for v in values)
+    return size
+
+
+class _Entry(NamedTuple):
+    # ServiceRecord یا با codec، CompactQuote؛ مدل‌ها برای هر فراخواننده تازه ساخته می‌شوند
+    services: Sequence[Any]
+    expires_at: float
+    size: int
+
+
+class QuoteCache:
+    """کش قیمت با TTL خود سرویس‌دهنده، حذف LRU با سقف حافظه و ادغام درخواست‌های هم‌زمان
+
+    درخواست‌های هم‌زمان برای یک کلید فقط یک بار fetch می‌شوند و بقیه منتظر همان نتیجه می‌مانند.
+    رکوردهای تغییرناپذیر نگه داشته می‌شوند و هر get مدل‌های خودش را می‌گیرد. با codec،
+    سرویس‌ها به صورت CompactQuote (کد به جای رشته) نگه داشته می‌شوند.
+    ttl صفر از سمت سرویس‌دهنده یعنی پاسخ کش نشود.
+    """
+
+    def __init__(self, adapter: RideAdapter, fetch: Fetch, max_bytes: int = 64 << 20,
+                 max_entries: Optional[int] = None, default_ttl: float = 60.0,
+                 precision: int = 4, clock: Callable[[], float] = time.monotonic,
+                 codec: Optional[QuoteCodec] = None):
+        self.adapter = adapter
+        self.fetch = fetch
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.precision = precision
+        self.clock = clock
+        self.codec = codec
+        self._entries: "OrderedDict[TripKey, _Entry]" = OrderedDict()
+        self._flight = SingleFlight()
+        self.size = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def misses(self) -> int:
+        return self._flight.leaders
+
+    @property
+    def coalesced(self) -> int:
+        return self._flight.coalesced
+
+    async def get(self, origin: Location, destinations: Sequence[Location],
+                  has_return: bool = False, waiting_time: int = 0) -> List["BaseServiceModel"]:
+        key = trip_key(origin, destinations, has_return, waiting_time, self.precision)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._models(entry.services)
+            self._remove(key)
+
+        return self._models(await self._flight.do(
+            key, lambda: self._load(key, origin, destinations, has_return, waiting_time)))
+
+    async def _load(self, key: TripKey, origin: Location, destinations: Sequence[Location],
+                    has_return: bool, waiting_time: int) -> Sequence[Any]:
+        raw = await self.fetch(origin, destinations, has_return, waiting_time)
+        data = self.adapter.parse(raw)
+        ttl = data.get("data", {}).get("ttl")
+        if ttl is None:
+            ttl = self.default_ttl
+        records = self.adapter.normalize_records(data)
+        services = tuple(records) if self.codec is None else self.codec.encode_many(records)
+        if ttl > 0:
+            self._store(key, services, ttl)
+        return services
+
+    def _models(self, services: Sequence[Any]) -> List["BaseServiceModel"]:
+        records = services if self.codec is None else self.codec.decode_many(services)
+        return to_models(records, self.adapter.validate)
+
+    def _store(self, key: TripKey, services: Sequence[Any], ttl: float) -> None:
+        if key in self._entries:
+            self._remove(key)
+        entry = _Entry(services, self.clock() + ttl, _estimate_size(services))
+        self._entries[key] = entry
+        self.size += entry.size
+        while self._entries and (self.size > self.max_bytes or
+                                 (self.max_entries is not None and len(self._entries) > self.max_entries)):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: TripKey) -> None:
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+
+    def invalidate(self, key: Optional[TripKey] = None) -> None:
+        if key is None:
+            self._entries.clear()
+            self.size = 0
+        elif key in self._entries:
+            self._remove(key)
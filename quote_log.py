@@ -0,0 +1,197 @@
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from interning import StringTable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"QLOG"
+# نسخه‌ی 2: کدها از StringTable (کد 0 یعنی None)؛ نسخه‌ی 1 None را "" ثبت می‌کرد
+VERSION = 2
+HEADER = struct.Struct("<4sHH8x")
+# ts_ns, price, service, provider, is_discounted, padding -> ۲۴ بایت با هم‌ترازی ۸ بایتی
+RECORD = struct.Struct("<qdIBB2x")
+
+NUMPY_DTYPE = None
+if np is not None:
+    NUMPY_DTYPE = np.dtype({
+        "names": ["ts_ns", "price", "service", "provider", "is_discounted"],
+        "formats": ["<i8", "<f8", "<u4", "u1", "u1"],
+        "offsets": [0, 8, 16, 20, 21],
+        "itemsize": RECORD.size,
+    })
+
+
+class LogRecord(NamedTuple):
+    ts_ns: int
+    price: float
+    service: int
+    provider: int
+    is_discounted: int
+
+
+def _keys_path(path: str) -> str:
+    return path + ".keys"
+
+
+def _load_keys(path: str) -> Dict[str, StringTable]:
+    # هر خط فایل .keys کد بعدی جدول همان نوع است؛ None (کد 0) هیچ‌وقت نوشته نمی‌شود
+    tables = {"provider": StringTable(), "service": StringTable()}
+    if os.path.exists(_keys_path(path)):
+        with open(_keys_path(path), encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    kind, value = json.loads(line)
+                    tables[kind].encode(value)
+    return tables
+
+
+def _check_header(path: str) -> int:
+    """اندازه‌ی فایل موجود؛ فایلی که لاگ قیمت (همین نسخه) نیست رد می‌شود
+
+    فایل کوتاه‌تر از هدر فقط وقتی پذیرفته می‌شود (و از نو نوشته می‌شود) که ابتدای همان هدر باشد،
+    یعنی نوشتن هدر در یک crash نیمه‌کاره مانده.
+    """
+    header = HEADER.pack(MAGIC, VERSION, RECORD.size)
+    with open(path, "rb") as f:
+        head = f.read(HEADER.size)
+        size = os.fstat(f.fileno()).st_size
+    if len(head) < HEADER.size:
+        if header.startswith(head):
+            return len(head)
+    else:
+        magic, version, record_size = HEADER.unpack_from(head)
+        if magic == MAGIC and version == VERSION and record_size == RECORD.size:
+            return size
+    raise ValueError(f"{path} is not a quote log (version {VERSION})")
+
+
+class QuoteLogWriter:
+    """لاگ فقط-افزودنی با رکوردهای طول ثابت
+
+    رشته‌های provider و service_key یک بار در فایل کناری .keys ثبت می‌شوند و
+    رکوردها فقط کد عددی آن‌ها را نگه می‌دارند.
+    """
+
+    def __init__(self, path: str, buffer_records: int = 4096):
+        self.path = path
+        self.buffer_records = buffer_records
+        size = _check_header(path) if os.path.exists(path) else 0
+        self._file = open(path, "ab")
+        if size < HEADER.size:
+            self._file.truncate(0)
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            # تا اولین flush هم فایل برای QuoteLogReader قابل باز کردن باشد
+            self._file.flush()
+        else:
+            # رکورد ناقص احتمالی از یک crash قبلی حذف می‌شود
+            self._file.truncate(HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size)
+        self._tables = _load_keys(path)
+        self._keys = open(_keys_path(path), "a", encoding="utf-8")
+        self._pending = bytearray()
+        self._pending_count = 0
+
+    def _code(self, kind: str, value: Optional[str]) -> int:
+        table = self._tables[kind]
+        code = table.code(value)
+        if code is None:
+            code = table.encode(value)
+            self._keys.write(json.dumps([kind, value], ensure_ascii=False) + "\n")
+            self._keys.flush()
+        return code
+
+    def write(self, records: Iterable[Any], ts_ns: Optional[int] = None) -> None:
+        if ts_ns is None:
+            ts_ns = time.time_ns()
+        pack = RECORD.pack
+        for r in records:
+            self._pending += pack(
+                ts_ns,
+                float("nan") if r.price is None else r.price,
+                self._code("service", r.service_key),
+                self._code("provider", r.provider),
+                1 if r.is_discounted else 0,
+            )
+            self._pending_count += 1
+        if self._pending_count >= self.buffer_records:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self._file.write(self._pending)
+            self._pending.clear()
+            self._pending_count = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+        self._keys.close()
+
+    def __enter__(self) -> "QuoteLogWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class QuoteLogReader:
+    """خواندن لاگ با mmap؛ پیمایش و نمای NumPy بدون کپی داده
+
+    تا وقتی آرایه‌ی برگشتی از to_numpy زنده است close() خطای BufferError می‌دهد.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # هدر نیمه‌کاره (crash هنگام ساختن فایل) هنوز لاگ قابل خواندن نیست
+        if _check_header(path) < HEADER.size:
+            raise ValueError(f"{path} is not a quote log (version {VERSION})")
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._count = (len(self._mm) - HEADER.size) // RECORD.size
+        tables = _load_keys(path)
+        self.providers: List[Optional[str]] = tables["provider"].values
+        self.service_keys: List[Optional[str]] = tables["service"].values
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> LogRecord:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return LogRecord(*RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size))
+
+    def records_view(self) -> memoryview:
+        return memoryview(self._mm)[HEADER.size:HEADER.size + self._count * RECORD.size]
+
+    def __iter__(self) -> Iterator[LogRecord]:
+        view = self.records_view()
+        try:
+            for fields in RECORD.iter_unpack(view):
+                yield LogRecord(*fields)
+        finally:
+            view.release()
+
+    def to_numpy(self) -> "np.ndarray":
+        if np is None:
+            raise ImportError("numpy is required for QuoteLogReader.to_numpy()")
+        return np.frombuffer(self._mm, dtype=NUMPY_DTYPE, count=self._count, offset=HEADER.size)
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "QuoteLogReader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
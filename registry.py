@@ -0,0 +1,40 @@
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List, Type, Union
+
+if TYPE_CHECKING:
+    from config import RideAdapter
+
+# نام سرویس‌دهنده -> "module:Class"؛ ماژول آداپتور فقط با اولین استفاده import می‌شود
+_TARGETS: Dict[str, Union[str, Type["RideAdapter"]]] = {
+    "tapsi": "config:TapsiPriceAdapter",
+    "snapp": "config:SnappAdapter",
+}
+
+
+def register(name: str, target: Union[str, Type["RideAdapter"]]) -> None:
+    """ثبت آداپتور تازه؛ target یا خود کلاس است یا رشته‌ی "module:Class" برای import تنبل"""
+    _TARGETS[name] = target
+
+
+def names() -> List[str]:
+    return sorted(_TARGETS)
+
+
+def get_adapter_class(name: str) -> Type["RideAdapter"]:
+    try:
+        target = _TARGETS[name]
+    except KeyError:
+        raise LookupError(f"unknown provider {name!r}") from None
+    if isinstance(target, str):
+        module_name, _, attr = target.partition(":")
+        target = _TARGETS[name] = getattr(importlib.import_module(module_name), attr)
+    return target
+
+
+def create_adapter(name: str, **kwargs: Any) -> "RideAdapter":
+    return get_adapter_class(name)(**kwargs)
+
+
+def create_adapters(**kwargs: Any) -> Dict[str, "RideAdapter"]:
+    """یک نمونه از هر آداپتور ثبت‌شده با تنظیمات یکسان"""
+    return {name: create_adapter(name, **kwargs) for name in names()}
@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
+
+import registry
+from decoders import get_decoder
+
+if TYPE_CHECKING:
+    from config import RideAdapter
+
+_decoder = get_decoder()
+
+
+def iter_captures(path: str) -> Iterator[Tuple[int, bytes]]:
+    """خط به خط؛ هیچ‌وقت کل فایل در حافظه نیست"""
+    with open(path, "rb") as f:
+        for lineno, line in enumerate(f, 1):
+            if line.strip():
+                yield lineno, line
+
+
+class ReplayStats:
+    def __init__(self):
+        self.lines = 0
+        self.services = 0
+        self.errors: Dict[str, int] = {}
+        self.elapsed = 0.0
+
+    def error(self, reason: str) -> None:
+        self.errors[reason] = self.errors.get(reason, 0) + 1
+
+
+async def _adapt_capture(adapters: Dict[str, "RideAdapter"], line: bytes) -> Tuple[Dict[str, Any], int]:
+    capture = _decoder.loads(line)
+    provider = capture.get("provider")
+    adapter = adapters.get(provider)
+    if adapter is None:
+        raise LookupError(f"unknown provider {provider!r}")
+    response = capture.get("response")
+    if isinstance(response, dict):
+        records = adapter.normalize_records(response)
+    else:
+        records = await adapter.adapt_records(response)
+    out = {
+        "id": capture.get("id", capture.get("request_id")),
+        "provider": provider,
+        "services": [r._asdict() for r in records],
+    }
+    return out, len(records)
+
+
+async def replay(in_path: str, out_path: str, concurrency: int = 8,
+                 adapters: Optional[Dict[str, "RideAdapter"]] = None) -> ReplayStats:
+    """بازپخش فایل JSONL ضبط‌شده: هر خط {"provider": ..., "response": ...}
+
+    response می‌تواند رشته‌ی خام یا شیء JSON باشد. خروجی به ترتیب تکمیل نوشته می‌شود
+    و شماره‌ی خط ورودی در هر سطر خروجی هست.
+    """
+    if adapters is None:
+        adapters = registry.create_adapters()
+    stats = ReplayStats()
+    started = time.perf_counter()
+    inbox: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 4)
+    outbox: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 4)
+
+    async def produce():
+        for item in iter_captures(in_path):
+            await inbox.put(item)
+        for _ in range(concurrency):
+            await inbox.put(None)
+
+    async def work():
+        while (item := await inbox.get()) is not None:
+            lineno, line = item
+            try:
+                out, n = await _adapt_capture(adapters, line)
+            except Exception as e:
+                stats.error(type(e).__name__)
+                continue
+            out["line"] = lineno
+            stats.services += n
+            await outbox.put(out)
+        await outbox.put(None)
+
+    async def write():
+        remaining = concurrency
+        with open(out_path, "w", encoding="utf-8") as f:
+            while remaining:
+                out = await outbox.get()
+                if out is None:
+                    remaining -= 1
+                    continue
+                f.write(json.dumps(out, ensure_ascii=False))
+                f.write("\n")
+                stats.lines += 1
+
+    await asyncio.gather(produce(), write(), *(work() for _ in range(concurrency)))
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="بازپخش ضبط‌های JSONL از طریق آداپتورها")
+    parser.add_argument("input", help="JSONL with one {provider, response} object per line")
+    parser.add_argument("output", help="normalized JSONL output")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=0, help="offload raw-string responses to N processes")
+    args = parser.parse_args()
+
+    executor = ProcessPoolExecutor(args.processes) if args.processes else None
+    adapters = registry.create_adapters(executor=executor)
+    result = asyncio.run(replay(args.input, args.output, args.concurrency, adapters))
+    if executor is not None:
+        executor.shutdown()
+    print(f"{result.lines:,} lines -> {result.services:,} services in {result.elapsed:.2f}s"
+          + (f", errors: {result.errors}" if result.errors else ""))
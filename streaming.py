@@ -0,0 +1,135 @@
+import codecs
+import json
+from typing import IO, Any, Iterator, Union
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+DEFAULT_MAX_DOCUMENT_SIZE = 64 << 20
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+_NUMBER_TAIL = "0123456789.eE+-"
+
+
+def _iter_text(fileobj: IO[Union[str, bytes]], chunk_size: int) -> Iterator[str]:
+    utf8 = None
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, bytes):
+            if utf8 is None:
+                utf8 = codecs.getincrementaldecoder("utf-8")()
+            chunk = utf8.decode(chunk)
+        if chunk:
+            yield chunk
+    if utf8 is not None:
+        tail = utf8.decode(b"", final=True)
+        if tail:
+            yield tail
+
+
+class DocumentError(ValueError):
+    """سند خراب یا بزرگ‌تر از max_document_size؛ offset شماره‌ی کاراکتر از ابتدای جریان است"""
+
+    def __init__(self, msg: str, offset: int):
+        super().__init__(f"{msg} (character {offset} of the stream)")
+        self.msg = msg
+        self.offset = offset
+
+
+def _maybe_truncated(e: json.JSONDecodeError, buf: str) -> bool:
+    # خطای ناشی از بریده شدن سند فقط در انتهای بافر رخ می‌دهد (یا رشته‌ای که بسته نشده)؛
+    # خطای وسط بافر یعنی JSON خراب و خواندن بیشتر کمکی نمی‌کند
+    return e.pos >= len(buf) - 6 or e.msg.startswith("Unterminated string")
+
+
+def iter_json_documents(fileobj: IO[Union[str, bytes]], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        max_document_size: int = DEFAULT_MAX_DOCUMENT_SIZE) -> Iterator[Any]:
+    # یک آرایه‌ی JSON سطح بالا یا فایل JSONL را سند به سند می‌خواند؛
+    # حافظه فقط به اندازه‌ی بزرگ‌ترین سند (حداکثر max_document_size کاراکتر) رشد می‌کند نه کل فایل
+    chunks = _iter_text(fileobj, chunk_size)
+    buf = ""
+    pos = 0
+    # موقعیت buf[0] در کل جریان
+    base = 0
+    in_array = None
+    # داخل آرایه: بعد از هر عنصر دقیقاً یک "," یا "]" و بعد از "]" فقط فاصله
+    first = True
+    need_separator = False
+    closed = False
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+
+        if pos == len(buf):
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            base += len(buf)
+            buf, pos = chunk, 0
+            continue
+
+        if closed:
+            raise DocumentError("extra data after the top-level array", base + pos)
+
+        if in_array is None:
+            in_array = buf[pos] == "["
+            if in_array:
+                pos += 1
+            continue
+
+        if in_array:
+            c = buf[pos]
+            if c == "]" and (first or need_separator):
+                closed = True
+                pos += 1
+                continue
+            if need_separator:
+                if c != ",":
+                    raise DocumentError("expected ',' or ']' after array element", base + pos)
+                need_separator = False
+                pos += 1
+                continue
+            if c in ",]":
+                raise DocumentError("expected array element", base + pos)
+
+        error = None
+        try:
+            obj, end = _decoder.raw_decode(buf, pos)
+            # عدد انتهای بافر ممکن است نیمه‌کاره باشد ("3." یا "1e" که ادامه‌اش در تکه‌ی بعدی است)
+            truncated = isinstance(obj, (int, float)) and not buf[end:].lstrip(_NUMBER_TAIL)
+        except json.JSONDecodeError as e:
+            if not _maybe_truncated(e, buf):
+                raise DocumentError(e.msg, base + e.pos) from None
+            obj, truncated, error = None, True, e
+
+        if truncated:
+            if len(buf) - pos > max_document_size:
+                raise DocumentError(f"document larger than {max_document_size} characters", base + pos)
+            pending = [buf[pos:]]
+            wanted = max(chunk_size, len(buf) - pos)
+            read = 0
+            while read < wanted:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.append(chunk)
+                read += len(chunk)
+            if not read:
+                if error is not None:
+                    # سند ناقص در انتهای فایل
+                    raise DocumentError(error.msg, base + error.pos)
+                yield obj
+                break
+            base += pos
+            buf, pos = "".join(pending), 0
+            continue
+
+        yield obj
+        pos = end
+        first = False
+        need_separator = in_array
+
+    if in_array and not closed:
+        # dump نیمه‌کاره؛ بی‌صدا تمام کردن یعنی از دست رفتن بقیه‌ی داده
+        raise DocumentError("unterminated array", base + len(buf))
@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import itertools
+import json
+from typing import Dict, Iterator, Optional
+
+import main as samples
+
+
+def default_routes(replay_path: Optional[str] = "generated_data_list.json") -> Dict[str, Iterator[bytes]]:
+    """/tapsi و /snapp نمونه‌های ثابت؛ /snapp/replay پاسخ‌های generated_data_list.json را به نوبت"""
+    routes = {
+        "/tapsi": itertools.repeat(samples.tapsi_raw.encode()),
+        "/snapp": itertools.repeat(samples.snapp_raw.encode()),
+    }
+    if replay_path:
+        with open(replay_path, "rb") as f:
+            bodies = [json.dumps(r, ensure_ascii=False).encode() for r in json.load(f)]
+        routes["/snapp/replay"] = itertools.cycle(bodies)
+    return routes
+
+
+class StubServer:
+    """سرور HTTP/1.1 ساده با keep-alive برای تست توان عملیاتی کلاینت‌ها و آداپتورها"""
+
+    def __init__(self, routes: Optional[Dict[str, Iterator[bytes]]] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.routes = routes if routes is not None else default_routes()
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._server: Optional[asyncio.Server] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> "StubServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*self._connections.values(), return_exceptions=True)
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> "StubServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                _, target, _ = lines[0].split(" ", 2)
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length:
+                    await reader.readexactly(length)
+
+                self.requests += 1
+                bodies = self.routes.get(target.split("?", 1)[0])
+                status, body = ("200 OK", next(bodies)) if bodies is not None else ("404 Not Found", b"{}")
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+
+async def _serve(host: str, port: int) -> None:
+    server = await StubServer(host=host, port=port).start()
+    print(f"stub server listening on {server.url} ({', '.join(server.routes)})")
+    await server._server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    asyncio.run(_serve(args.host, args.port))
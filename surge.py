@@ -0,0 +1,135 @@
+import time
+from array import array
+from bisect import bisect_left, insort
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+SURGE_START = "surge_start"
+SURGE_END = "surge_end"
+ANOMALY = "anomaly"
+
+
+class PriceEvent(NamedTuple):
+    kind: str
+    provider: str
+    service_key: str
+    price: float
+    median: float
+    # (price - median) / median
+    deviation: float
+    ts: float
+
+
+class RollingWindow:
+    """پنجره‌ی لغزان با اندازه‌ی ثابت روی یک ring buffer و یک کپی مرتب برای میانه
+
+    افزودن در ring buffer O(1) است؛ کپی مرتب با bisect به‌روز می‌شود (برای پنجره‌های
+    چند ده‌تایی جابه‌جایی حافظه‌اش ناچیز است).
+    """
+
+    __slots__ = ("size", "_ring", "_pos", "_sorted")
+
+    def __init__(self, size: int):
+        self.size = size
+        self._ring = array("d")
+        self._pos = 0
+        self._sorted: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def push(self, value: float) -> None:
+        ring = self._ring
+        if len(ring) < self.size:
+            ring.append(value)
+        else:
+            old = ring[self._pos]
+            ring[self._pos] = value
+            self._pos = (self._pos + 1) % self.size
+            del self._sorted[bisect_left(self._sorted, old)]
+        insort(self._sorted, value)
+
+    def median(self) -> float:
+        s = self._sorted
+        n = len(s)
+        mid = n // 2
+        return s[mid] if n % 2 else (s[mid - 1] + s[mid]) / 2
+
+
+class _ServiceState:
+    __slots__ = ("window", "surged")
+
+    def __init__(self, size: int):
+        self.window = RollingWindow(size)
+        self.surged = False
+
+
+class SurgeDetector:
+    """تشخیص لحظه‌ای surge و قیمت‌های غیرعادی از خروجی آداپتورها
+
+    برای هر (provider, service_key) یک پنجره‌ی لغزان نگه داشته می‌شود:
+    - عوض شدن is_surged رویداد surge_start/surge_end می‌دهد
+    - فاصله‌ی نسبی قیمت از میانه‌ی پنجره بیش از threshold رویداد anomaly می‌دهد
+      (فقط وقتی پنجره دست‌کم min_samples قیمت دارد)
+    قیمت هر رکورد بعد از مقایسه به پنجره اضافه می‌شود.
+    """
+
+    def __init__(self, window: int = 64, threshold: float = 0.25, min_samples: int = 8,
+                 clock: Callable[[], float] = time.time):
+        self.window = window
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.clock = clock
+        self._services: Dict[Tuple[str, str], _ServiceState] = {}
+        self.quotes = 0
+        self.events = 0
+
+    def __len__(self) -> int:
+        return len(self._services)
+
+    def update(self, record: Any, ts: Optional[float] = None) -> List[PriceEvent]:
+        """record می‌تواند ServiceRecord یا BaseServiceModel باشد"""
+        return self.feed((record,), ts)
+
+    def feed(self, records: Iterable[Any], ts: Optional[float] = None) -> List[PriceEvent]:
+        if ts is None:
+            ts = self.clock()
+        events: List[PriceEvent] = []
+        services = self._services
+        threshold = self.threshold
+        min_samples = self.min_samples
+        for r in records:
+            price = r.price
+            if price is None:
+                continue
+            self.quotes += 1
+            key = (r.provider, r.service_key)
+            state = services.get(key)
+            if state is None:
+                state = services[key] = _ServiceState(self.window)
+            window = state.window
+
+            median = window.median() if len(window) else price
+            deviation = (price - median) / median if median else 0.0
+            surged = bool(getattr(r, "is_surged", False))
+            if surged != state.surged:
+                state.surged = surged
+                events.append(PriceEvent(SURGE_START if surged else SURGE_END,
+                                         key[0], key[1], price, median, deviation, ts))
+            if len(window) >= min_samples and abs(deviation) > threshold:
+                events.append(PriceEvent(ANOMALY, key[0], key[1], price, median, deviation, ts))
+            window.push(price)
+        self.events += len(events)
+        return events
+
+    async def consume(self, batches: AsyncIterable[Iterable[Any]]) -> AsyncIterator[PriceEvent]:
+        """مثلاً consume(adapter.adapt_stream(f)) یا هر منبع لیست رکورد"""
+        async for records in batches:
+            for event in self.feed(records):
+                yield event
+
+    def median(self, provider: str, service_key: str) -> Optional[float]:
+        state = self._services.get((provider, service_key))
+        return state.window.median() if state is not None and len(state.window) else None
+
+    def stats(self) -> dict:
+        return {"quotes": self.quotes, "events": self.events, "services": len(self._services)}
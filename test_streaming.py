@@ -0,0 +1,92 @@
+import io
+import json
+
+import pytest
+
+from streaming import DocumentError, iter_json_documents
+
+DOCS = [
+    {"title": "اقتصادی", "price": 125000, "ratio": 3.5, "tags": ["a", "b"]},
+    {"title": "کلاسیک", "price": -1e3, "ok": True, "none": None},
+    [1, 2.25, "x"],
+    42,
+    "رشته",
+]
+
+
+def _read(text, chunk_size=7, binary=False):
+    fileobj = io.BytesIO(text.encode()) if binary else io.StringIO(text)
+    return list(iter_json_documents(fileobj, chunk_size))
+
+
+@pytest.mark.parametrize("binary", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 16])
+def test_array_and_jsonl(chunk_size, binary):
+    array = json.dumps(DOCS, ensure_ascii=False)
+    jsonl = "\n".join(json.dumps(d, ensure_ascii=False) for d in DOCS) + "\n"
+    assert _read(array, chunk_size, binary) == DOCS
+    assert _read(jsonl, chunk_size, binary) == DOCS
+
+
+def test_utf8_split_across_chunks():
+    # هر حرف فارسی دو بایت است؛ تکه‌های یک‌بایتی همه‌ی آن‌ها را وسط می‌بُرند
+    text = json.dumps([{"t": "تخفیف ویژه"}], ensure_ascii=False)
+    assert _read(text, 1, binary=True) == [{"t": "تخفیف ویژه"}]
+
+
+@pytest.mark.parametrize("number", ["3.5", "1e3", "-12", "125000", "2.5E-2"])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3])
+def test_numbers_split_across_chunks(number, chunk_size):
+    assert _read(f"[{number}, {number}]", chunk_size) == [json.loads(number)] * 2
+    assert _read(f"{number}\n{number}", chunk_size) == [json.loads(number)] * 2
+
+
+def test_empty_input():
+    assert _read("") == []
+    assert _read("[]") == []
+    assert _read(" [ ] \n") == []
+
+
+@pytest.mark.parametrize("text", [
+    '[{"a": 1}, {"a": 2}',
+    '[{"a": 1},',
+    "[1,2",
+    "[",
+    '[{"a": 1}, {"a": ',
+    '{"a": 1}\n{"a": "unterminated',
+    '{"a": 1}\n{"a": [1, 2',
+])
+@pytest.mark.parametrize("chunk_size", [1, 4, 1 << 16])
+def test_truncated_input_raises(text, chunk_size):
+    with pytest.raises(DocumentError):
+        _read(text, chunk_size)
+
+
+@pytest.mark.parametrize("text", [
+    '[{"a": 1}{"a": 2}]',
+    '[{"a": 1},,,{"a": 2}]',
+    "[,1]",
+    "[1,]",
+    '[{"a": 1}] garbage',
+    "[1] [2]",
+    '{"a": 1}\n{"a": nope}\n{"a": 3}',
+])
+@pytest.mark.parametrize("chunk_size", [1, 4, 1 << 16])
+def test_malformed_input_raises(text, chunk_size):
+    with pytest.raises(DocumentError):
+        _read(text, chunk_size)
+
+
+def test_error_offset_is_relative_to_stream():
+    text = '{"a": 1}\n' * 100 + '{"a": nope}\n'
+    with pytest.raises(DocumentError) as info:
+        _read(text, 16)
+    assert info.value.offset == text.index("nope")
+    assert str(info.value) == f"Expecting value (character {info.value.offset} of the stream)"
+
+
+def test_max_document_size():
+    text = json.dumps([{"t": "x" * 1000}])
+    with pytest.raises(DocumentError):
+        list(iter_json_documents(io.StringIO(text), 64, max_document_size=100))
+    assert list(iter_json_documents(io.StringIO(text), 64, max_document_size=2000)) == [{"t": "x" * 1000}]
@@ -0,0 +1,39 @@
+from typing import Any, Awaitable, Callable, Dict, Mapping, NamedTuple, Sequence, Tuple, Union
+
+from decoders import RawResponse
+
+Location = Union[Mapping[str, float], Tuple[float, float]]
+Fetch = Callable[[Location, Sequence[Location], bool, int], Awaitable[RawResponse]]
+
+
+class TripKey(NamedTuple):
+    origin: Tuple[float, float]
+    destinations: Tuple[Tuple[float, float], ...]
+    has_return: bool
+    waiting_time: int
+
+
+def _point(location: Location, precision: int) -> Tuple[float, float]:
+    if isinstance(location, Mapping):
+        location = location.get("location", location)
+        lat, lng = location["latitude"], location["longitude"]
+    else:
+        lat, lng = location
+    return round(lat, precision), round(lng, precision)
+
+
+def trip_key(origin: Location, destinations: Sequence[Location], has_return: bool = False,
+             waiting_time: int = 0, precision: int = 4) -> TripKey:
+    """کلید کش؛ مختصات گرد می‌شوند (۴ رقم اعشار حدود ۱۰ متر)"""
+    return TripKey(
+        _point(origin, precision),
+        tuple(_point(d, precision) for d in destinations),
+        bool(has_return),
+        int(waiting_time or 0),
+    )
+
+
+def trip_key_from_response(data: Dict[str, Any], precision: int = 4) -> TripKey:
+    body = data.get("data", {})
+    return trip_key(body["origin"], body.get("destinations", []),
+                    body.get("hasReturn", False), body.get("waitingTime", 0), precision)